@@ -11,6 +11,7 @@ from apps.balancesheet.models.long_term_liability import *
 from apps.balancesheet.models.revenue import *
 from apps.balancesheet.models.current_liability import *
 from apps.balancesheet.models import *
+from apps.balancesheet.utils.balance_sheet_read import clear_balance_sheet_cache
 from django import forms
 import nested_admin
 ####
@@ -693,3 +694,22 @@ class BalanceSheetAdmin(nested_admin.NestedModelAdmin):
         CurrentAssetInline,FixedAssetInline, CurrentLiabilityInline, LongTermLiabilityInline, EquityInline
         , RevenueInline, ExpenseInline, #ContingentAccountsInline, 
     ]   
+
+    # The sections and accounts are saved through the inlines, so the cached
+    # data is dropped once the whole change form is saved
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        balance_sheet = form.instance
+        clear_balance_sheet_cache(balance_sheet.company_id, balance_sheet.year)
+        if change and {"company", "year"} & set(form.changed_data):
+            clear_balance_sheet_cache(form.initial["company"], form.initial["year"])
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        clear_balance_sheet_cache(obj.company_id, obj.year)
+
+    def delete_queryset(self, request, queryset):
+        deleted = list(queryset.values_list("company_id", "year"))
+        super().delete_queryset(request, queryset)
+        for company_id, year in deleted:
+            clear_balance_sheet_cache(company_id, year)
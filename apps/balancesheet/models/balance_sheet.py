@@ -48,33 +48,10 @@ class BalanceSheet(models.Model):
         return f"Balance Sheet - {self.company.title} - {self.year}"
 
     def get_all_data(self):
+        # Nested section -> leaf -> field data, one query and cached per year
+        from apps.balancesheet.utils.balance_sheet_read import get_balance_sheet_data
 
-        data = {}
-        # Loop through all related objects
-        for related_object in self._meta.related_objects:
-            related_name = related_object.get_accessor_name()
-            related_manager = getattr(self, related_name, None)
-            if related_manager is None:
-                continue
-
-            items = []
-            for obj in related_manager.all():
-                obj_data = {}
-                for field in obj._meta.fields:
-                    if field.name == "id":
-                        continue
-                    value = getattr(obj, field.name)
-                    # Handle JSONField with {"amount": ...}
-                    if isinstance(value, dict) and "amount" in value:
-                        value = value["amount"]
-                    obj_data[field.name] = value  # Use English field names
-                items.append(obj_data)
-
-            # Use model class name as key
-            model_name = related_object.related_model.__name__
-            data[model_name] = items
-
-        return data
+        return get_balance_sheet_data(self.company_id, self.year)
 
 
 
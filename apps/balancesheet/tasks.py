@@ -1,24 +1,66 @@
 from.utils.balance_sheet_ecxel_reader import read_balance_sheet_excel
 from.utils.balance_sheet_json_insert import insert_balance_sheet_data
+from.utils.balance_sheet_read import clear_balance_sheet_cache
+from.utils.upload_job import UploadJob
 from celery import shared_task
+from django.conf import settings
 
 import logging
+import os
+import time
 logger = logging.getLogger(__name__)
 
 
 
 
 
-# @shared_task
-def analyze_balance_sheet(file_path, company_id, year):
-    balance_sheet_json = read_balance_sheet_excel(file_path)
-    logger.info("Parsed balance sheet JSON: %s", balance_sheet_json)
+@shared_task
+def analyze_balance_sheet(job_id, file_path, company_id, year):
+    """
+    Parse the uploaded trial balance and store it, reporting the progress on
+    the upload job: ``parsing`` -> ``inserting`` -> ``done`` or ``failed``.
+    """
+    job = UploadJob(job_id)
+    started = time.perf_counter()
+    job.update(UploadJob.PARSING, started_at=time.time())
 
     try:
+        debug_path = None
+        if settings.BALANCE_SHEET_DEBUG_DIR:
+            debug_path = os.path.join(settings.BALANCE_SHEET_DEBUG_DIR, f"balance_sheet_{job_id}.json")
+        balance_sheet_json, unmapped = read_balance_sheet_excel(file_path, debug_path=debug_path)
+        parsed = time.perf_counter()
+        sections = balance_sheet_json.get('BalanceSheet', {})
+        job.update(
+            UploadJob.INSERTING,
+            counts={'accounts': sum(
+                len(accounts)
+                for sub_sections in sections.values()
+                for accounts in sub_sections.values()
+            ), 'unmapped': len(unmapped)},
+            timings={'parse': round(parsed - started, 3)},
+            unmapped_accounts=unmapped,
+        )
+
         bs = insert_balance_sheet_data(balance_sheet_json, company_id=company_id, year=year)
-        logger.info("Inserted BalanceSheet ID %s", bs.id)
-        return f"Inserted BalanceSheet ID {bs.id}"
-    
+        clear_balance_sheet_cache(company_id, year)
     except Exception as e:
-        logger.error("Error inserting balance sheet: %s", e, exc_info=True)
-        return f"Error inserting balance sheet: {e}"
\ No newline at end of file
+        logger.error("Error analyzing balance sheet (job %s): %s", job_id, e, exc_info=True)
+        job.update(
+            UploadJob.FAILED,
+            timings={'total': round(time.perf_counter() - started, 3)},
+            error=str(e),
+        )
+        return f"Error inserting balance sheet: {e}"
+
+    finished = time.perf_counter()
+    job.update(
+        UploadJob.DONE,
+        timings={
+            'insert': round(finished - parsed, 3),
+            'total': round(finished - started, 3),
+        },
+        balance_sheet_id=bs.id,
+    )
+    logger.info("Inserted BalanceSheet ID %s (job %s)", bs.id, job_id)
+    return f"Inserted BalanceSheet ID {bs.id}"
@@ -1,3 +1,392 @@
-from django.test import TestCase
+import json
+from types import SimpleNamespace
 
-# Create your tests here.
+import pytest
+from django.contrib import admin
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.cache import cache
+from openpyxl import Workbook
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.balancesheet import tasks
+from apps.balancesheet.admin import BalanceSheetAdmin
+from apps.balancesheet.models.balance_sheet import BalanceSheet
+from apps.balancesheet.models.contingent_account import ContingentCounterparties
+from apps.balancesheet.models.current_asset import Cash
+from apps.balancesheet.models.equity import InitialCapital
+from apps.balancesheet.utils.balance_sheet_ecxel_reader import (
+    SHEET_NAME,
+    normalize_farsi,
+    read_balance_sheet_excel,
+)
+from apps.balancesheet.utils.balance_sheet_json_insert import (
+    BALANCE_SHEET_SCHEMA,
+    insert_balance_sheet_data,
+)
+from apps.balancesheet.utils.balance_sheet_read import (
+    balance_sheet_cache_key,
+    get_balance_sheet_data,
+)
+from apps.balancesheet.utils.upload_job import UploadJob
+from apps.balancesheet.views import BalanceSheetFileUploadViewSet
+from apps.company.models import CompanyProfile, CompanyUser
+from apps.core.models import User
+
+
+@pytest.fixture
+def company(db):
+    cache.clear()
+    return CompanyProfile.objects.create(
+        tech_field=None, special_field=None, province=None, city=None
+    )
+
+
+def write_trial_balance(path, accounts):
+    """Trial-balance sheet with the Cash sub-section of the current assets."""
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = SHEET_NAME
+    sheet.append(["کد", "گروه"])
+    sheet.append([None, "دارایی‌های جاری"])
+    sheet.append([None, None, None, "موجودی نقد"])
+    for code, (name, debit, credit) in enumerate(accounts, start=1101):
+        sheet.append([None, None, None, None, code, name, debit, credit])
+    workbook.save(path)
+    return path
+
+
+class TestReadBalanceSheetExcel:
+    def test_normalize_farsi_unifies_spelling(self):
+        assert normalize_farsi(" تنخواه\u200cگردان (ها) ") == normalize_farsi(
+            "تنخواه گردانها"
+        )
+        assert normalize_farsi("سرمايه") == "سرمایه"
+
+    def test_accounts_are_matched_by_normalized_name(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        path = write_trial_balance(
+            tmp_path / "trial.xlsx",
+            [
+                ("صندوق", 1200, None),
+                ("تنخواه گردان ها", None, 300),
+                ("حساب ناشناخته", None, None),
+            ],
+        )
+
+        balance_sheet, unmapped = read_balance_sheet_excel(path)
+
+        assert balance_sheet["BalanceSheet"]["CurrentAsset"]["Cash"] == {
+            "cash_in_hand": {"type": "debit", "amount": 1200},
+            "petty_cash": {"type": "credit", "amount": 300},
+            "حساب ناشناخته": {"type": "debit", "amount": 0},
+        }
+        assert unmapped == [
+            {
+                "name": "حساب ناشناخته",
+                "normalized_name": "حسابناشناخته",
+                "main_section": "CurrentAsset",
+                "sub_section": "Cash",
+            }
+        ]
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_debug_dump_is_opt_in(self, tmp_path):
+        path = write_trial_balance(tmp_path / "trial.xlsx", [("صندوق", 1, None)])
+
+        balance_sheet, unmapped = read_balance_sheet_excel(
+            path, debug_path=tmp_path / "debug.json"
+        )
+
+        dump = json.loads((tmp_path / "debug.json").read_text(encoding="utf-8"))
+        assert dump == {"BalanceSheet": balance_sheet["BalanceSheet"], "unmapped": []}
+
+
+@pytest.mark.django_db
+class TestInsertBalanceSheetData:
+    def get_json(self, cash_in_hand):
+        return {
+            "BalanceSheet": {
+                "CurrentAsset": {
+                    "Cash": {"cash_in_hand": {"type": "debit", "amount": cash_in_hand}}
+                },
+                "Equity": {
+                    "InitialCapital": {
+                        "initial_capital": {"type": "credit", "amount": 5000.0}
+                    }
+                },
+                "ContingentAccount": {
+                    "ContingentCounterparties": {
+                        "our_counterparties_with_others": {
+                            "type": "debit",
+                            "amount": 70.0,
+                        }
+                    }
+                },
+            }
+        }
+
+    def test_every_model_is_written_once(self, company, django_assert_max_num_queries):
+        models = sum(len(leaves) + 1 for leaves in BALANCE_SHEET_SCHEMA.values())
+
+        # Company load, balance sheet get_or_create with its savepoints and
+        # one upsert per model
+        with django_assert_max_num_queries(models + 8):
+            balance_sheet = insert_balance_sheet_data(
+                self.get_json(1200.0), company.id, 1402
+            )
+
+        cash = Cash.objects.get(current_asset__balance_sheet=balance_sheet)
+        assert cash.cash_in_hand == {"type": "debit", "amount": 1200}
+        # Accounts missing from the sheet keep the model default
+        assert cash.petty_cash == {"type": "debit", "amount": 0}
+        capital = InitialCapital.objects.get(equity__balance_sheet=balance_sheet)
+        assert capital.amount == {"type": "credit", "amount": 5000}
+        counterparties = ContingentCounterparties.objects.get()
+        assert counterparties.amount == 70
+        assert counterparties.others_counterparties_with_us == "N/A"
+
+    def test_reupload_overwrites_the_same_year(self, company):
+        BalanceSheet.objects.create(company=company, year=1402)
+        insert_balance_sheet_data(self.get_json(1200.0), company.id, 1402)
+
+        balance_sheet = insert_balance_sheet_data(
+            self.get_json(900.0), company.id, 1402
+        )
+
+        assert BalanceSheet.objects.get() == balance_sheet
+        assert Cash.objects.get().cash_in_hand == {"type": "debit", "amount": 900}
+
+
+@pytest.mark.django_db
+class TestBalanceSheetData:
+    def test_nested_data_is_read_with_one_query_and_cached(
+        self, company, django_assert_num_queries
+    ):
+        json_data = {
+            "BalanceSheet": {
+                "CurrentAsset": {
+                    "Cash": {"cash_in_hand": {"type": "debit", "amount": 1200.0}}
+                }
+            }
+        }
+        balance_sheet = insert_balance_sheet_data(json_data, company.id, 1402)
+
+        with django_assert_num_queries(1):
+            data = get_balance_sheet_data(company.id, 1402)
+        with django_assert_num_queries(0):
+            assert balance_sheet.get_all_data() == data
+
+        assert data.keys() == {model.__name__ for model in BALANCE_SHEET_SCHEMA}
+        assert data["CurrentAsset"]["Cash"] == {
+            "cash_in_hand": {"type": "debit", "amount": 1200},
+            "bank_balances": {"type": "debit", "amount": 0},
+            "petty_cash": {"type": "debit", "amount": 0},
+            "cash_in_transit": {"type": "debit", "amount": 0},
+        }
+        assert data["ContingentAccount"]["ContingentAccounts"] == {
+            "our_accounts_with_others": 0,
+            "others_accounts_with_us": 0,
+        }
+
+    def test_missing_balance_sheet_returns_none(self, company):
+        assert get_balance_sheet_data(company.id, 1402) is None
+        assert cache.get(balance_sheet_cache_key(company.id, 1402)) is None
+
+
+@pytest.mark.django_db
+class TestBalanceSheetAdminCache:
+    json_data = {
+        "BalanceSheet": {
+            "CurrentAsset": {
+                "Cash": {"cash_in_hand": {"type": "debit", "amount": 1200.0}}
+            }
+        }
+    }
+
+    @pytest.fixture
+    def balance_sheet(self, company):
+        balance_sheet = insert_balance_sheet_data(self.json_data, company.id, 1402)
+        get_balance_sheet_data(company.id, 1402)
+        return balance_sheet
+
+    @pytest.fixture
+    def model_admin(self):
+        return BalanceSheetAdmin(BalanceSheet, admin.site)
+
+    def save_change_form(
+        self, model_admin, balance_sheet, changed_data=(), initial=None
+    ):
+        form = SimpleNamespace(
+            instance=balance_sheet,
+            changed_data=list(changed_data),
+            initial=initial or {},
+            save_m2m=lambda: None,
+        )
+        model_admin.save_related(None, form, [], True)
+
+    def test_inline_edits_drop_the_cached_data(
+        self, company, balance_sheet, model_admin, django_capture_on_commit_callbacks
+    ):
+        Cash.objects.update(cash_in_hand={"type": "debit", "amount": 900})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.save_change_form(model_admin, balance_sheet)
+            # Deferred until the change form's transaction commits
+            assert cache.get(balance_sheet_cache_key(company.id, 1402)) is not None
+
+        data = get_balance_sheet_data(company.id, 1402)
+        assert data["CurrentAsset"]["Cash"]["cash_in_hand"]["amount"] == 900
+
+    def test_moved_year_drops_both_entries(
+        self, company, balance_sheet, model_admin, django_capture_on_commit_callbacks
+    ):
+        balance_sheet.year = 1403
+        balance_sheet.save()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            self.save_change_form(
+                model_admin,
+                balance_sheet,
+                changed_data=["year"],
+                initial={"company": company.id, "year": 1402},
+            )
+
+        assert get_balance_sheet_data(company.id, 1402) is None
+        assert get_balance_sheet_data(company.id, 1403) is not None
+
+    def test_deletes_drop_the_cached_data(
+        self, company, balance_sheet, model_admin, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            model_admin.delete_queryset(None, BalanceSheet.objects.all())
+
+        assert cache.get(balance_sheet_cache_key(company.id, 1402)) is None
+        assert get_balance_sheet_data(company.id, 1402) is None
+
+
+class FakeBalanceSheet:
+    id = 7
+
+
+@pytest.mark.django_db
+class TestAnalyzeBalanceSheet:
+    def test_job_reports_counts_and_timings(
+        self, company, monkeypatch, django_capture_on_commit_callbacks
+    ):
+        parsed = {"BalanceSheet": {"CurrentAsset": {"Cash": {"petty_cash": {}}}}}
+        unmapped = [
+            {
+                "name": "x",
+                "normalized_name": "x",
+                "main_section": "CurrentAsset",
+                "sub_section": "Cash",
+            }
+        ]
+        monkeypatch.setattr(
+            tasks,
+            "read_balance_sheet_excel",
+            lambda path, debug_path: (parsed, unmapped),
+        )
+        monkeypatch.setattr(
+            tasks, "insert_balance_sheet_data", lambda *args, **kwargs: FakeBalanceSheet
+        )
+        job = UploadJob.create(company_id=company.id, year=1402)
+        cache.set(balance_sheet_cache_key(company.id, 1402), {"stale": {}})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            tasks.analyze_balance_sheet(job.job_id, "trial.xlsx", company.id, 1402)
+
+        data = job.get()
+        assert data["status"] == UploadJob.DONE
+        assert data["balance_sheet_id"] == FakeBalanceSheet.id
+        assert data["counts"] == {"accounts": 1, "unmapped": 1}
+        assert data["unmapped_accounts"] == unmapped
+        assert data["timings"].keys() == {"parse", "insert", "total"}
+        assert cache.get(balance_sheet_cache_key(company.id, 1402)) is None
+
+    def test_job_records_the_failure(self, company, monkeypatch):
+        def fail(path, debug_path):
+            raise ValueError("Worksheet named 'تراز آزمایشی' not found")
+
+        monkeypatch.setattr(tasks, "read_balance_sheet_excel", fail)
+        job = UploadJob.create(company_id=company.id, year=1402)
+
+        tasks.analyze_balance_sheet(job.job_id, "trial.xlsx", company.id, 1402)
+
+        data = job.get()
+        assert data["status"] == UploadJob.FAILED
+        assert "not found" in data["error"]
+
+
+@pytest.mark.django_db
+class TestUpload:
+    def test_upload_is_accepted_with_a_job(
+        self,
+        company,
+        tmp_path,
+        settings,
+        monkeypatch,
+        django_capture_on_commit_callbacks,
+    ):
+        settings.MEDIA_ROOT = tmp_path / "media"
+        queued = []
+        monkeypatch.setattr(
+            tasks.analyze_balance_sheet, "delay", lambda *args: queued.append(args)
+        )
+        user = User.objects.create(phone_number="09999999999")
+        CompanyUser.objects.create(user=user, company=company)
+        path = write_trial_balance(tmp_path / "trial.xlsx", [("صندوق", 1200, 0)])
+        upload = SimpleUploadedFile("trial.xlsx", path.read_bytes())
+        request = APIRequestFactory().post(
+            "/upload/", {"file": upload, "year": 1402}, format="multipart"
+        )
+        force_authenticate(request, user)
+        view = BalanceSheetFileUploadViewSet.as_view({"post": "upload"})
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = view(request)
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data.keys() == {
+            "message",
+            "file_url",
+            "company",
+            "year",
+            "created_at",
+            "job_id",
+            "status",
+        }
+        assert response.data["status"] == UploadJob.QUEUED
+        (args,) = queued
+        assert args[0] == response.data["job_id"]
+        assert args[2:] == (company.id, 1402)
+
+
+@pytest.mark.django_db
+class TestUploadJobStatus:
+    def get_job(self, company, phone_number, job_id):
+        user = User.objects.create(phone_number=phone_number)
+        CompanyUser.objects.create(user=user, company=company)
+        request = APIRequestFactory().get(f"/jobs/{job_id}/")
+        force_authenticate(request, user)
+        view = BalanceSheetFileUploadViewSet.as_view({"get": "job"})
+        return view(request, job_id=job_id)
+
+    def test_company_user_reads_its_job(self, company):
+        job = UploadJob.create(company_id=company.id, year=1402)
+
+        response = self.get_job(company, "09999999999", job.job_id)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["status"] == UploadJob.QUEUED
+
+    def test_other_companies_jobs_are_hidden(self, company):
+        job = UploadJob.create(company_id=company.id, year=1402)
+        other = CompanyProfile.objects.create(
+            tech_field=None, special_field=None, province=None, city=None
+        )
+
+        response = self.get_job(other, "09999999998", job.job_id)
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,90 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.balancesheet.models.balance_sheet import BalanceSheet
+from apps.balancesheet.utils.balance_sheet_json_insert import (
+    BALANCE_SHEET_SCHEMA,
+    get_account_fields,
+    get_parent_field,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_relation_paths():
+    """
+    ``select_related`` path of every section and leaf, e.g.
+    ``current_assets_cash__cash_items``, keyed by their models.
+    """
+    paths = {}
+    for section_model, leaf_models in BALANCE_SHEET_SCHEMA.items():
+        section_field = section_model._meta.get_field("balance_sheet")
+        section_path = section_field.remote_field.get_accessor_name()
+        paths[section_model] = section_path
+        for leaf_model in leaf_models:
+            parent_field = get_parent_field(leaf_model, section_model)
+            leaf_path = parent_field.remote_field.get_accessor_name()
+            paths[leaf_model] = f"{section_path}__{leaf_path}"
+    return paths
+
+
+RELATION_PATHS = get_relation_paths()
+
+
+def balance_sheet_cache_key(company_id, year):
+    return f"balance_sheet_data_{company_id}_{year}"
+
+
+def clear_balance_sheet_cache(company_id, year):
+    """Drop the cached data once the current transaction, if any, commits."""
+    cache_key = balance_sheet_cache_key(company_id, year)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+def build_balance_sheet_data(balance_sheet) -> dict:
+    """
+    Nested ``{section: {leaf: {field: value}}}`` data of a balance sheet
+    loaded with ``RELATION_PATHS``; missing sections and leaves are skipped.
+    """
+    data = {}
+    for section_model, leaf_models in BALANCE_SHEET_SCHEMA.items():
+        section = getattr(balance_sheet, RELATION_PATHS[section_model], None)
+        if section is None:
+            continue
+        leaves = data[section_model.__name__] = {}
+        for leaf_model in leaf_models:
+            accessor = RELATION_PATHS[leaf_model].rsplit("__", 1)[-1]
+            leaf = getattr(section, accessor, None)
+            if leaf is None:
+                continue
+            leaves[leaf_model.__name__] = {
+                field: getattr(leaf, field) for field in get_account_fields(leaf_model)
+            }
+    return data
+
+
+def get_balance_sheet_data(company_id, year):
+    """
+    Cached nested data of the company's balance sheet of ``year``, read with a
+    single query, or None when it was never uploaded.
+    """
+    cache_key = balance_sheet_cache_key(company_id, year)
+    data = cache.get(cache_key)
+    if data is not None:
+        return data
+
+    balance_sheet = (
+        BalanceSheet.objects.select_related(*RELATION_PATHS.values())
+        .filter(company_id=company_id, year=year)
+        .first()
+    )
+    if balance_sheet is None:
+        return None
+
+    data = build_balance_sheet_data(balance_sheet)
+    cache.set(cache_key, data, settings.BALANCE_SHEET_DATA_CACHE_TIMEOUT)
+    logger.debug("Balance sheet data cached: %s", cache_key)
+    return data
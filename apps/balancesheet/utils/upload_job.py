@@ -0,0 +1,66 @@
+import logging
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class UploadJob:
+    """
+    Progress of one balance-sheet upload, kept in the shared cache so the API
+    can report it while the Celery task runs.
+
+    Status moves through ``queued`` -> ``parsing`` -> ``inserting`` -> ``done``,
+    or to ``failed`` with the error message.
+    """
+
+    QUEUED = "queued"
+    PARSING = "parsing"
+    INSERTING = "inserting"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, job_id):
+        self.job_id = str(job_id)
+
+    @property
+    def cache_key(self):
+        return f"balancesheet_upload_job_{self.job_id}"
+
+    @classmethod
+    def create(cls, company_id, year):
+        job = cls(uuid.uuid4())
+        cache.set(
+            job.cache_key,
+            {
+                "job_id": job.job_id,
+                "company_id": company_id,
+                "year": year,
+                "status": cls.QUEUED,
+                "queued_at": time.time(),
+                "counts": {},
+                "timings": {},
+                "error": None,
+            },
+            settings.BALANCE_SHEET_UPLOAD_JOB_TIMEOUT,
+        )
+        return job
+
+    def get(self):
+        return cache.get(self.cache_key)
+
+    def update(self, status=None, counts=None, timings=None, **fields):
+        """Merge the given counts, timings and fields into the stored job."""
+        data = self.get()
+        if data is None:
+            logger.warning("Upload job %s expired before it was updated", self.job_id)
+            return
+        if status is not None:
+            data["status"] = status
+        data["counts"].update(counts or {})
+        data["timings"].update(timings or {})
+        data.update(fields)
+        cache.set(self.cache_key, data, settings.BALANCE_SHEET_UPLOAD_JOB_TIMEOUT)
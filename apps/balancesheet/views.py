@@ -165,7 +165,9 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from .serializers import BalanceSheetFileUploadSerializer
 from .tasks import analyze_balance_sheet
+from .utils.upload_job import UploadJob
 from apps.company.models.company import CompanyUser
+from django.db import transaction
 from rest_framework.permissions import IsAuthenticated
 
 import logging
@@ -180,6 +182,13 @@ class BalanceSheetFileUploadViewSet(viewsets.ViewSet):
 
     @action(detail=False, methods=['post'])
     def upload(self, request):
+        """
+        Store the trial balance and parse it in the background.
+
+        Answers 202 with ``job_id`` and ``status`` instead of the former 201
+        with ``task_response``: the parse result is no longer known when the
+        request returns, clients poll ``jobs/<job_id>/`` for it.
+        """
         serializer = BalanceSheetFileUploadSerializer(data=request.data)
         if not serializer.is_valid():
             return Response({"errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
@@ -200,10 +209,12 @@ class BalanceSheetFileUploadViewSet(viewsets.ViewSet):
             defaults={"excel_file": file_obj},
         )
 
-        # Call Celery task (sync for now)
-        response = analyze_balance_sheet(balance_sheet.excel_file.path,
-                                         company_id=company.id,
-                                         year=year)
+        # Parse and insert in the background, the job reports the progress
+        job = UploadJob.create(company_id=company.id, year=year)
+        file_path = balance_sheet.excel_file.path
+        transaction.on_commit(
+            lambda: analyze_balance_sheet.delay(job.job_id, file_path, company.id, year)
+        )
 
         return Response({
             "message": "File uploaded successfully",
@@ -211,9 +222,20 @@ class BalanceSheetFileUploadViewSet(viewsets.ViewSet):
             "company": company.title,
             "year": balance_sheet.year,
             "created_at": balance_sheet.created_at,
-            "year": balance_sheet.year,
-            "task_response": response,
-        }, status=status.HTTP_201_CREATED)
+            "job_id": job.job_id,
+            "status": UploadJob.QUEUED,
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>[^/.]+)')
+    def job(self, request, job_id=None):
+        data = UploadJob(job_id).get()
+        if data is None or not CompanyUser.objects.filter(
+            user=request.user, company_id=data["company_id"]
+        ).exists():
+            return Response({"errors": "Upload job not found."},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        return Response(data, status=status.HTTP_200_OK)
 
 
 
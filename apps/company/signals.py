@@ -1,29 +0,0 @@
-import logging
-
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
-from django.core.cache import cache
-
-
-from apps.finance.models import TaxDeclarationFile, BalanceReportFile
-from apps.tickets.models import Ticket
-
-
-logger = logging.getLogger("company")
-
-
-@receiver(post_save, sender=Ticket)
-@receiver(post_delete, sender=Ticket)
-@receiver(post_save, sender=TaxDeclarationFile)
-@receiver(post_delete, sender=TaxDeclarationFile)
-@receiver(post_save, sender=BalanceReportFile)
-@receiver(post_delete, sender=BalanceReportFile)
-def clear_dashboard_cache(sender, instance, **kwargs):
-    """
-    Signal to clear the cache when a Service instance is updated.
-    """
-    cache_key = f"dashboard_data_{instance.company.user.id}"
-    cache.delete(cache_key)
-    logger.info(
-        f"Cleared dashboard cache for user {instance.company.user.id} due to {sender.__name__} {instance.id} update."
-    )
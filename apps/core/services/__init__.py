@@ -1,2 +1,4 @@
 from apps.core.services.auth_service import AuthService  # noqa: F401
 from apps.core.services.user_service import UserService  # noqa: F401
+from apps.core.services.llm_gateway import LLMGateway, get_llm_gateway  # noqa: F401
+from apps.core.services.cache_namespace import CacheNamespace, company_cache  # noqa: F401
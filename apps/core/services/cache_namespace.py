@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger("core")
+
+
+class CacheNamespace:
+    """
+    Versioned cache keys of one kind of owner, e.g. a company.
+
+    ``make_key`` embeds the owner's current version in every key, so a single
+    INCR in ``invalidate()`` drops all of them at once; the orphaned entries
+    simply expire. Invalidations requested inside a transaction are collected
+    and applied once, after the commit.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pending = threading.local()
+
+    def version_key(self, owner_id) -> str:
+        return f"{self.name}_cache_version_{owner_id}"
+
+    def get_version(self, owner_id) -> int:
+        version_key = self.version_key(owner_id)
+        version = cache.get(version_key)
+        if version is None:
+            # A fresh timestamp never collides with a version lost by eviction
+            cache.add(version_key, time.time_ns(), timeout=None)
+            version = cache.get(version_key)
+        return version
+
+    def make_key(self, owner_id, key: str, version=None) -> str:
+        """``key`` under the owner's current (or the given) version."""
+        if version is None:
+            version = self.get_version(owner_id)
+        return f"{key}_v{version}"
+
+    def invalidate(self, owner_ids, keys=()):
+        """
+        Bump the version of every owner once and delete the extra unversioned
+        ``keys`` with a single ``delete_many``.
+        """
+        if transaction.get_connection().in_atomic_block:
+            owners, pending_keys = self.get_pending()
+            owners.update(owner_ids)
+            pending_keys.update(keys)
+            # Later callbacks of the same transaction find nothing left to flush
+            transaction.on_commit(self.flush)
+            return
+        self.apply(set(owner_ids), set(keys))
+
+    def get_pending(self) -> tuple[set, set]:
+        if not hasattr(self.pending, "owners"):
+            self.pending.owners, self.pending.keys = set(), set()
+        return self.pending.owners, self.pending.keys
+
+    def flush(self):
+        owners, keys = self.get_pending()
+        if owners or keys:
+            self.pending.owners, self.pending.keys = set(), set()
+            self.apply(owners, keys)
+
+    def apply(self, owner_ids: set, keys: set):
+        for owner_id in owner_ids:
+            try:
+                cache.incr(self.version_key(owner_id))
+            except ValueError:
+                # No version yet, so nothing was cached under this owner
+                pass
+        if keys:
+            cache.delete_many(list(keys))
+        logger.debug(
+            "Cache namespace %s invalidated for %s (%d extra keys)",
+            self.name,
+            sorted(owner_ids, key=str),
+            len(keys),
+        )
+
+
+# Everything cached per company: chart payloads, financial series, ...
+company_cache = CacheNamespace("company")
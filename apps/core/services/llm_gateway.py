@@ -0,0 +1,198 @@
+import json
+import logging
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger("core")
+
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+
+class LLMGatewayError(Exception):
+    pass
+
+
+class LLMCircuitOpenError(LLMGatewayError):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Fail fast after ``failure_threshold`` consecutive failures; after
+    ``reset_timeout`` seconds a single trial call is let through again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.lock = threading.Lock()
+
+    def before_call(self):
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                raise LLMCircuitOpenError("LLM circuit is open, skipping the request")
+            # Half-open: let this call probe the upstream, keep the others out
+            self.opened_at = time.monotonic()
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(
+                        "LLM circuit opened after %d consecutive failures",
+                        self.failures,
+                    )
+                self.opened_at = time.monotonic()
+
+
+class LLMGateway:
+    """
+    Chat-completions client shared by every LLM feature.
+
+    One pooled ``requests.Session`` is reused for all calls, at most
+    ``max_concurrency`` requests are in flight per process, transient errors
+    are retried with exponential backoff and jitter, and a circuit breaker stops
+    calling an upstream that keeps failing.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = 60,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        backoff: float = 1.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.semaphore = threading.BoundedSemaphore(max_concurrency)
+        self.circuit = CircuitBreaker(failure_threshold, reset_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+
+    def chat(self, model, messages, on_delta=None, **options) -> dict:
+        """
+        Send a chat completion and return the response body.
+
+        With ``on_delta`` the completion is streamed: the callback receives the
+        text received so far after every chunk, and the returned body has the
+        same ``choices[0].message.content`` shape as a non-streamed response.
+        Extra ``options`` (e.g. ``response_format``) are sent in the payload.
+        """
+        payload = {"model": model, "messages": messages, **options}
+        if on_delta is not None:
+            payload["stream"] = True
+
+        for attempt in range(self.max_retries + 1):
+            self.circuit.before_call()
+            try:
+                with self.semaphore:
+                    result = self.send(payload, on_delta)
+            except LLMGatewayError as e:
+                self.circuit.record_failure()
+                if attempt == self.max_retries:
+                    raise
+                delay = self.backoff * 2**attempt * (1 + random.random())
+                logger.warning(
+                    "LLM request failed (%s), retry %d/%d in %.1fs",
+                    e,
+                    attempt + 1,
+                    self.max_retries,
+                    delay,
+                )
+                time.sleep(delay)
+            else:
+                self.circuit.record_success()
+                return result
+
+    def send(self, payload, on_delta=None) -> dict:
+        try:
+            response = self.session.post(
+                f"{self.base_url}/chat/completions",
+                json=payload,
+                timeout=self.timeout,
+                stream=on_delta is not None,
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise LLMGatewayError(str(e)) from e
+
+        with response:
+            if response.status_code in RETRYABLE_STATUS_CODES:
+                raise LLMGatewayError(f"upstream returned {response.status_code}")
+            response.raise_for_status()
+            if on_delta is None:
+                return response.json()
+            try:
+                return self.read_stream(response, on_delta)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                raise LLMGatewayError(str(e)) from e
+
+    @staticmethod
+    def read_stream(response, on_delta) -> dict:
+        """Accumulate the ``data:`` events of a server-sent completion stream."""
+        content = []
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:") :].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            delta = chunk.get("choices", [{}])[0].get("delta", {}).get("content")
+            if delta:
+                content.append(delta)
+                on_delta("".join(content))
+        return {
+            "choices": [{"message": {"role": "assistant", "content": "".join(content)}}]
+        }
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide gateway configured from the ``LLM_*`` settings."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway(
+                base_url=settings.LLM_BASE_URL,
+                api_key=settings.FARABIN_GEMINI_API_KEY,
+                timeout=settings.LLM_TIMEOUT,
+                max_concurrency=settings.LLM_MAX_CONCURRENCY,
+                max_retries=settings.LLM_MAX_RETRIES,
+                backoff=settings.LLM_RETRY_BACKOFF,
+                failure_threshold=settings.LLM_CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.LLM_CIRCUIT_RESET_TIMEOUT,
+            )
+        return _gateway
@@ -0,0 +1,47 @@
+import pytest
+from django.core.cache import cache
+
+from apps.core.services.cache_namespace import CacheNamespace
+
+
+@pytest.fixture
+def namespace():
+    cache.clear()
+    return CacheNamespace("test")
+
+
+def test_keys_follow_the_owner_version(namespace):
+    key = namespace.make_key(1, "report_1")
+    cache.set(key, "cached")
+
+    assert namespace.make_key(1, "report_1") == key
+    assert namespace.make_key(2, "report_2").startswith("report_2_v")
+
+    namespace.invalidate([1, 1])
+
+    assert namespace.make_key(1, "report_1") != key
+    assert cache.get(namespace.make_key(1, "report_1")) is None
+
+
+def test_extra_keys_are_deleted(namespace):
+    cache.set_many({"dashboard_data_1": 1, "dashboard_data_2": 2})
+
+    namespace.invalidate([], keys=["dashboard_data_1", "dashboard_data_2"])
+
+    assert cache.get_many(["dashboard_data_1", "dashboard_data_2"]) == {}
+
+
+@pytest.mark.django_db
+def test_invalidations_in_a_transaction_are_applied_once_on_commit(
+    namespace, django_capture_on_commit_callbacks, monkeypatch
+):
+    keys = {owner_id: namespace.make_key(owner_id, "report") for owner_id in (1, 2)}
+    bumped = []
+    monkeypatch.setattr(cache, "incr", lambda key, *args, **kwargs: bumped.append(key))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        for _ in range(100):
+            namespace.invalidate([1, 2])
+        assert bumped == []
+
+    assert sorted(bumped) == sorted(namespace.version_key(owner) for owner in keys)
@@ -0,0 +1,113 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from apps.core.services.llm_gateway import (
+    LLMCircuitOpenError,
+    LLMGateway,
+    LLMGatewayError,
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Chat-completions stub answering with the queued ``responses`` in order."""
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.requests.append(payload)
+        status = server.responses.pop(0) if server.responses else 200
+
+        if status != 200:
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if payload.get("stream"):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for delta in ("سلام", " دنیا"):
+                chunk = {"choices": [{"delta": {"content": delta}}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.write(b"data: [DONE]\n\n")
+            return
+
+        body = json.dumps(
+            {"choices": [{"message": {"role": "assistant", "content": "ok"}}]}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.requests, server.responses = [], []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def make_gateway(server, **kwargs):
+    host, port = server.server_address
+    options = {"max_retries": 2, "backoff": 0, "failure_threshold": 3, **kwargs}
+    return LLMGateway(f"http://{host}:{port}/v1", "test-key", **options)
+
+
+def test_chat_returns_completion_and_reuses_session(stub_server):
+    gateway = make_gateway(stub_server)
+    messages = [{"role": "user", "content": "hi"}]
+
+    for _ in range(2):
+        response = gateway.chat("gpt-4o", messages, temperature=0)
+        assert response["choices"][0]["message"]["content"] == "ok"
+
+    assert stub_server.requests[0] == {
+        "model": "gpt-4o",
+        "messages": messages,
+        "temperature": 0,
+    }
+
+
+def test_transient_errors_are_retried(stub_server):
+    stub_server.responses = [503, 429]
+    gateway = make_gateway(stub_server)
+
+    response = gateway.chat("gpt-4o", [])
+
+    assert response["choices"][0]["message"]["content"] == "ok"
+    assert len(stub_server.requests) == 3
+
+
+def test_circuit_opens_after_repeated_failures(stub_server):
+    stub_server.responses = [500] * 3
+    gateway = make_gateway(stub_server, reset_timeout=60)
+
+    with pytest.raises(LLMGatewayError):
+        gateway.chat("gpt-4o", [])
+    with pytest.raises(LLMCircuitOpenError):
+        gateway.chat("gpt-4o", [])
+    assert len(stub_server.requests) == 3
+
+
+def test_streaming_reports_partial_text(stub_server):
+    gateway = make_gateway(stub_server)
+    partials = []
+
+    response = gateway.chat("gpt-4o", [], on_delta=partials.append)
+
+    assert stub_server.requests[0]["stream"] is True
+    assert partials == ["سلام", "سلام دنیا"]
+    assert response["choices"][0]["message"]["content"] == "سلام دنیا"
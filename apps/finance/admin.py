@@ -24,6 +24,8 @@ from apps.finance.models import (
     SoldProductFee,
     TaxDeclarationFile,
 )
+from apps.finance.services.finance_service import FinanceService
+from apps.finance.services.inflation import InflationTable
 
 
 class ProfitStatementInline(admin.StackedInline):
@@ -250,7 +252,7 @@ class CalculatedDataAdmin(admin.ModelAdmin):
     financial_month.short_description = _("Month")
 
     def make_published(self, request, queryset):
-        updated_count = queryset.update(is_published=True)
+        updated_count = FinanceService.publish_financial_data(queryset)
         self.message_user(
             request,
             _(f"{updated_count} record(s) were successfully marked as published."),
@@ -357,3 +359,15 @@ class InflationAdmin(admin.ModelAdmin):
     list_display = ["year", "cpi_value", "inflation_rate"]
     search_fields = ["year"]
     list_per_page = 20
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        InflationTable.invalidate()
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        InflationTable.invalidate()
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        InflationTable.invalidate()
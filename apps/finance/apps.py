@@ -8,4 +8,4 @@ class FinanceConfig(AppConfig):
     verbose_name = _("Finance")
 
     def ready(self) -> None:
-        pass
+        import apps.finance.signals  # noqa: F401
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent once per company after its FinancialData rows were written in bulk.
+# Arguments: company_id, financial_data_ids
+company_financials_refreshed = Signal()
@@ -5,6 +5,7 @@ from django.core.management import BaseCommand
 from django.db import transaction
 
 from apps.finance.models import Inflation
+from apps.finance.services.inflation import InflationTable
 
 
 class Command(BaseCommand):
@@ -37,6 +38,7 @@ class Command(BaseCommand):
                             )
                 values.reverse()
                 Inflation.objects.bulk_create(values)
+                transaction.on_commit(InflationTable.invalidate)
             self.stdout.write(
                 self.style.SUCCESS("Successfully saved the fixture ratios")
             )
@@ -225,7 +225,7 @@ class FinanceExcelFile(models.Model):
                     default_storage.delete(old_file_path)
         if (
             FinanceExcelFile.objects.filter(
-                company=self.company, finance_excel_file=self.file
+                company=self.company, file=self.file
             )
             .exclude(pk=self.pk)
             .exists()
@@ -1050,14 +1050,10 @@ class FinancialData(LifecycleModelMixin, models.Model):
 
     @hook(hook=AFTER_SAVE)
     def generator(self):
-        from apps.finance.tasks import generate_analysis
+        from apps.finance.tasks import schedule_company_analysis
 
-        print("sdasd")
-        company = self.financial_asset.company.pk
         if self.is_published:
-            for chart_name, _ in AnalysisReport.CHART_CHOICES:
-                if chart_name != "life_cycle":
-                    generate_analysis.delay(company, chart_name)
+            schedule_company_analysis(self.financial_asset.company_id)
 
     class Meta:
         verbose_name = _("Financial Data")
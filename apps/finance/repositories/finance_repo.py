@@ -1,8 +1,15 @@
+from django.db import transaction
+from django.db.models import Count, Prefetch, Sum
+from django.utils import timezone
+
 from apps.finance.models import (
-    AnalysisReport,TaxDeclarationFile,
+    AnalysisReport,
+    TaxDeclarationFile,
     BalanceReportFile,
     FinanceExcelFile,
+    FinancialAsset,
     FinancialData,
+    SoldProductFee,
 )
 from constants.typing import CompanyProfileType, ModelType, QuerySetType
 
@@ -96,9 +103,16 @@ class FinanceRepository:
 
     @staticmethod
     def get_financial_charts_for_company(
-        company: CompanyProfileType, yearly: bool = True
+        company: CompanyProfileType, yearly: bool = True, chart_name=None
     ) -> ModelType:
-        return (
+        """
+        Published FinancialData of the company; with ``chart_name`` (one name or
+        several) the reports of those charts are prefetched into ``chart_reports``
+        with one extra query.
+        """
+        if isinstance(chart_name, str):
+            chart_name = [chart_name]
+        queryset = (
             FinancialData.objects.select_related("financial_asset")
             .filter(
                 financial_asset__company=company,
@@ -107,3 +121,197 @@ class FinanceRepository:
             )
             .order_by("financial_asset__year", "financial_asset__month")
         )
+        if chart_name is not None:
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "analysis_reports",
+                    queryset=AnalysisReport.objects.filter(chart_name__in=chart_name),
+                    to_attr="chart_reports",
+                )
+            )
+        return queryset
+
+    @staticmethod
+    def get_tax_financial_assets_for_company(
+        company: CompanyProfileType,
+    ) -> QuerySetType[FinancialAsset]:
+        return FinancialAsset.objects.filter(
+            company=company, is_tax_record=True
+        ).order_by("year", "month")
+
+    @staticmethod
+    def bulk_upsert_financial_data(
+        rows: dict[int, dict], batch_size: int = 500
+    ) -> list[FinancialData]:
+        """
+        Create or update one FinancialData per financial asset id in ``rows``.
+
+        Existing rows are loaded with a single query and written back with
+        ``bulk_update``; missing ones are inserted with ``bulk_create``. Bulk
+        writes bypass ``save()``, so no lifecycle hooks or post_save receivers run.
+        """
+        existing = {}
+        for financial_data in FinancialData.objects.filter(
+            financial_asset_id__in=rows.keys()
+        ).order_by("id"):
+            existing.setdefault(financial_data.financial_asset_id, financial_data)
+
+        now = timezone.now()
+        to_create, to_update = [], []
+        fields = set()
+        for asset_id, values in rows.items():
+            fields.update(values)
+            financial_data = existing.get(asset_id)
+            if financial_data is None:
+                to_create.append(FinancialData(financial_asset_id=asset_id, **values))
+                continue
+            for field, value in values.items():
+                setattr(financial_data, field, value)
+            financial_data.updated_at = now
+            to_update.append(financial_data)
+
+        with transaction.atomic():
+            FinancialData.objects.bulk_create(to_create, batch_size=batch_size)
+            if to_update:
+                FinancialData.objects.bulk_update(
+                    to_update, [*sorted(fields), "updated_at"], batch_size=batch_size
+                )
+
+        return to_create + to_update
+
+    @staticmethod
+    def bulk_upsert_analysis_reports(
+        calculated_data_id: int, period: str, texts: dict[str, str]
+    ) -> list[AnalysisReport]:
+        """Create or update the AnalysisReport of each chart name in ``texts``."""
+        return AnalysisReport.objects.bulk_create(
+            [
+                AnalysisReport(
+                    calculated_data_id=calculated_data_id,
+                    chart_name=chart_name,
+                    period=period,
+                    text=text,
+                )
+                for chart_name, text in texts.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["chart_name", "calculated_data"],
+            update_fields=["period", "text", "updated_at"],
+        )
+
+    @staticmethod
+    def get_financial_series_totals(
+        company: CompanyProfileType, exclude_asset_ids
+    ) -> dict:
+        """Sums of the stored whole-series inputs over the company's other tax periods."""
+        return (
+            FinancialData.objects.filter(
+                financial_asset__company=company,
+                financial_asset__is_tax_record=True,
+            )
+            .exclude(financial_asset_id__in=exclude_asset_ids)
+            .aggregate(
+                rows=Count("id"),
+                assets=Count("financial_asset", distinct=True),
+                inventory=Sum("inventory_average"),
+                total_asset=Sum("total_asset"),
+            )
+        )
+
+    @staticmethod
+    def get_sold_product_totals(asset_ids) -> dict:
+        """``sold_product_total_price`` of the first SoldProductFee of each asset."""
+        totals = {}
+        for asset_id, total in (
+            SoldProductFee.objects.filter(financial_asset_id__in=asset_ids)
+            .order_by("financial_asset_id", "id")
+            .values_list("financial_asset_id", "sold_product_total_price")
+        ):
+            totals.setdefault(asset_id, total)
+        return totals
+
+    @staticmethod
+    def bulk_update_financial_data_field(
+        field: str, values: dict, batch_size: int = 500
+    ) -> int:
+        """Set ``field`` of the FinancialData of each financial asset id in ``values``."""
+        now = timezone.now()
+        financial_data = list(
+            FinancialData.objects.filter(financial_asset_id__in=values.keys()).only(
+                "id", "financial_asset_id"
+            )
+        )
+        for item in financial_data:
+            setattr(item, field, values[item.financial_asset_id])
+            item.updated_at = now
+        return FinancialData.objects.bulk_update(
+            financial_data, [field, "updated_at"], batch_size=batch_size
+        )
+
+    @staticmethod
+    def get_or_create_financial_assets(
+        company_id: int, periods, is_tax_record: bool
+    ) -> dict[tuple, FinancialAsset]:
+        """
+        The company's financial asset of each (year, month) in ``periods``,
+        inserting the missing ones with one ``bulk_create``. No post_save
+        receivers run for new assets.
+        """
+        periods = list(dict.fromkeys(periods))
+        assets = {}
+        for asset in FinancialAsset.objects.filter(
+            company_id=company_id,
+            year__in={year for year, _ in periods},
+            is_tax_record=is_tax_record,
+        ).order_by("id"):
+            assets.setdefault((asset.year, asset.month), asset)
+
+        missing = [
+            FinancialAsset(
+                company_id=company_id,
+                year=year,
+                month=month,
+                is_tax_record=is_tax_record,
+            )
+            for year, month in periods
+            if (year, month) not in assets
+        ]
+        for asset in FinancialAsset.objects.bulk_create(missing):
+            assets[(asset.year, asset.month)] = asset
+        return {period: assets[period] for period in periods}
+
+    @staticmethod
+    def bulk_upsert_financial_statements(
+        model_class, rows: dict[int, dict], batch_size: int = 500
+    ) -> int:
+        """
+        Create or update one statement row of ``model_class`` per financial
+        asset id in ``rows``, mirroring ``bulk_upsert_financial_data``: the row
+        with the lowest id is updated, missing ones are inserted.
+        """
+        existing = {}
+        for statement in model_class.objects.filter(
+            financial_asset_id__in=rows.keys()
+        ).order_by("id"):
+            existing.setdefault(statement.financial_asset_id, statement)
+
+        to_create, to_update = [], []
+        fields = set()
+        for asset_id, values in rows.items():
+            fields.update(values)
+            statement = existing.get(asset_id)
+            if statement is None:
+                to_create.append(model_class(financial_asset_id=asset_id, **values))
+                continue
+            for field, value in values.items():
+                setattr(statement, field, value)
+            to_update.append(statement)
+
+        with transaction.atomic():
+            model_class.objects.bulk_create(to_create, batch_size=batch_size)
+            if to_update:
+                model_class.objects.bulk_update(
+                    to_update, sorted(fields), batch_size=batch_size
+                )
+
+        return len(to_create) + len(to_update)
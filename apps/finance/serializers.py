@@ -9,6 +9,7 @@ from apps.finance.models import (
     FinancialData,
     TaxDeclarationFile,
 )
+from apps.finance.services.utils import FinanceExcelValidator
 from constants.errors import FileYearAlreadyExists
 
 
@@ -107,14 +108,20 @@ class FinanceExcelFileSerializer(serializers.ModelSerializer):
         model = FinanceExcelFile
         fields = ["id", "company", "file", "is_saved", "is_sent"]
 
+    def validate_file(self, value):
+        # Reject malformed layouts here instead of inside the ingestion task
+        errors = FinanceExcelValidator(value).validate()
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
 
 class BaseChartSerializer(serializers.Serializer):
     financial_asset = serializers.SerializerMethodField()
     report = serializers.SerializerMethodField()
 
-    def __init__(self, *args, chart_name=None, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.chart_name = chart_name
+    # AnalysisReport.chart_name of the reports shown with this chart
+    chart_name = None
 
     def get_financial_asset(self, obj):
         # Start with the year always being included
@@ -127,9 +134,8 @@ class BaseChartSerializer(serializers.Serializer):
         return financial_asset_data
 
     def get_report(self, obj):
-        # Filter reports to only include those corresponding to the specified chart
-        reports = obj.analysis_reports.filter(chart_name=self.chart_name)
-        return AnalysisReportSerializer(reports, many=True).data
+        # Reports of this chart, prefetched by get_financial_charts_for_company
+        return AnalysisReportSerializer(obj.chart_reports, many=True).data
 
 
 class AssetChartSerializer(BaseChartSerializer):
@@ -137,15 +143,13 @@ class AssetChartSerializer(BaseChartSerializer):
     non_current_asset = serializers.DecimalField(max_digits=20, decimal_places=2)
     total_asset = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.ASSET_CHART, **kwargs)
+    chart_name = AnalysisReport.ASSET_CHART
 
 
 class SaleChartSerializer(BaseChartSerializer):
     net_sale = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.SALE_CHART, **kwargs)
+    chart_name = AnalysisReport.SALE_CHART
 
 
 class EquityChartSerializer(BaseChartSerializer):
@@ -153,15 +157,13 @@ class EquityChartSerializer(BaseChartSerializer):
     total_debt = serializers.DecimalField(max_digits=20, decimal_places=2)
     total_sum_equity_debt = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.DEBT_CHART, **kwargs)
+    chart_name = AnalysisReport.DEBT_CHART
 
 
 class BankrupsyChartSerializer(BaseChartSerializer):
     altman_bankrupsy_ratio = serializers.DecimalField(max_digits=5, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.BANKRUPSY_CHART, **kwargs)
+    chart_name = AnalysisReport.BANKRUPSY_CHART
 
 
 class ProfitibilityChartSerializer(BaseChartSerializer):
@@ -173,23 +175,20 @@ class ProfitibilityChartSerializer(BaseChartSerializer):
     profit_margin_ratio = serializers.DecimalField(max_digits=20, decimal_places=2)
     roe = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.PROFITIBILITY_CHART, **kwargs)
+    chart_name = AnalysisReport.PROFITIBILITY_CHART
 
 
 class InventoryChartSerializer(BaseChartSerializer):
     inventory_average = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.INVENTORY_CHART, **kwargs)
+    chart_name = AnalysisReport.INVENTORY_CHART
 
 
 class AgilityChartSerializer(BaseChartSerializer):
     instant_ratio = serializers.DecimalField(max_digits=20, decimal_places=2)
     stock_turnover = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.AGILITY_CHART, **kwargs)
+    chart_name = AnalysisReport.AGILITY_CHART
 
 
 class DebtChartSerializer(BaseChartSerializer):
@@ -197,8 +196,7 @@ class DebtChartSerializer(BaseChartSerializer):
     non_current_debt = serializers.DecimalField(max_digits=20, decimal_places=2)
     total_debt = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.DEBT_CHART, **kwargs)
+    chart_name = AnalysisReport.DEBT_CHART
 
 
 class SalaryChartSerializer(BaseChartSerializer):
@@ -206,8 +204,7 @@ class SalaryChartSerializer(BaseChartSerializer):
     salary_fee = serializers.DecimalField(max_digits=20, decimal_places=2)
     salary_production_fee = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.SALARY_CHART, **kwargs)
+    chart_name = AnalysisReport.SALARY_CHART
 
 
 class LeverageChartSerializer(BaseChartSerializer):
@@ -221,16 +218,14 @@ class LeverageChartSerializer(BaseChartSerializer):
         max_digits=20, decimal_places=2
     )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.LEVERAGE_CHART, **kwargs)
+    chart_name = AnalysisReport.LEVERAGE_CHART
 
 
 class LiquidityChartSerializer(BaseChartSerializer):
     current_ratio = serializers.DecimalField(max_digits=20, decimal_places=2)
     instant_ratio = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.LIQUIDITY_CHART, **kwargs)
+    chart_name = AnalysisReport.LIQUIDITY_CHART
 
 
 class CostChartSerializer(BaseChartSerializer):
@@ -239,8 +234,7 @@ class CostChartSerializer(BaseChartSerializer):
     construction_overhead = serializers.DecimalField(max_digits=20, decimal_places=2)
     production_total_price = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.COST_CHART, **kwargs)
+    chart_name = AnalysisReport.COST_CHART
 
 
 class ProfitChartSerializer(BaseChartSerializer):
@@ -250,8 +244,44 @@ class ProfitChartSerializer(BaseChartSerializer):
     proceed_profit = serializers.DecimalField(max_digits=20, decimal_places=2)
     net_profit = serializers.DecimalField(max_digits=20, decimal_places=2)
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, chart_name=AnalysisReport.PROFIT_CHART, **kwargs)
+    chart_name = AnalysisReport.PROFIT_CHART
+
+
+# Chart slug -> serializer of the chart's FinancialData series
+CHART_SERIALIZER_MAP = {
+    "debt": DebtChartSerializer,
+    "asset": AssetChartSerializer,
+    "sale": SaleChartSerializer,
+    "equity": EquityChartSerializer,
+    "bankruptcy": BankrupsyChartSerializer,
+    "bankrupsy": BankrupsyChartSerializer,
+    "profitability": ProfitibilityChartSerializer,
+    "inventory": InventoryChartSerializer,
+    "agility": AgilityChartSerializer,
+    "liquidity": LiquidityChartSerializer,
+    "leverage": LeverageChartSerializer,
+    "cost": CostChartSerializer,
+    "profit": ProfitChartSerializer,
+    "salary": SalaryChartSerializer,
+}
+
+# Charts of a batch request without ``names``: every chart once, without the
+# legacy "bankrupsy" spelling that single-chart URLs still accept
+BATCH_CHART_NAMES = (
+    "debt",
+    "asset",
+    "sale",
+    "equity",
+    "bankruptcy",
+    "profitability",
+    "inventory",
+    "agility",
+    "liquidity",
+    "leverage",
+    "cost",
+    "profit",
+    "salary",
+)
 
 
 class AnalysisReportSerializer(serializers.ModelSerializer):
@@ -0,0 +1,368 @@
+import hashlib
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from apps.finance.models import AnalysisReport, FinancialData
+from apps.finance.repositories import FinanceRepository as _repo
+from apps.finance.services.charts import clear_chart_cache
+
+logger = logging.getLogger("finance")
+
+ANALYSIS_MODEL = "gpt-4o"
+
+# Bump whenever a prompt below changes so cached analysis texts are not reused
+ANALYSIS_PROMPT_VERSION = 1
+
+ANALYSIS_CACHE_HITS_KEY = "finance_analysis_text_cache_hits"
+ANALYSIS_CACHE_MISSES_KEY = "finance_analysis_text_cache_misses"
+
+SYSTEM_PROMPT = "You are a helpful, expert financial analyst, you only response in persian structured markdown"
+
+# Chart name -> prompt and the FinancialData series sent with it
+ANALYSIS_CHARTS: dict[str, dict[Union[str, List[float]]]] = {
+    "sale": {
+        "prompt": (
+            "You are a senior financial analyst. Analyze the company's sales performance using the provided values for net sales, gross profit, operational income/expense, and marketing fee. "
+            "Deliver a thorough, insightful, and data-driven assessment, highlighting key trends, strengths, weaknesses, and actionable recommendations. "
+            "Present your analysis in clear, structured Persian markdown."
+        ),
+        "net_sale": [],
+        "gross_profit": [],
+        "operational_income_expense": [],
+        "marketing_fee": [],
+    },
+    "debt": {
+        "prompt": (
+            "You are a senior financial analyst. Using the provided data for trade payables, advance payments, reserves, long-term payables, and employee termination benefit reserves, "
+            "provide a comprehensive and insightful analysis of the company's debt situation. Discuss trends, risk factors, and offer actionable recommendations. "
+            "Present your findings in clear, structured Persian markdown."
+        ),
+        "trade_payable": [],
+        "advance": [],
+        "reserves": [],
+        "long_term_payable": [],
+        # "long_term_financial": [],
+        "employee_termination_benefit_reserve": [],
+    },
+    "asset": {
+        "prompt": (
+            "You are a senior financial analyst. Analyze the company's asset performance using the provided values for current assets, non-current assets, inventory average, and total assets. "
+            "Deliver a detailed, insightful, and data-driven assessment, highlighting key trends, strengths, weaknesses, and actionable recommendations. "
+            "Present your analysis in clear, structured Persian markdown."
+        ),
+        # "cash_balance": [],
+        # "trade_receivable": [],
+        # "property_investment": [],
+        # "intangible_asset": [],
+        # "long_term_investment": [],
+        "inventory_average": [],
+        "current_asset": [],
+        "non_current_asset": [],
+        "total_asset": [],
+    },
+    "profit": {
+        "prompt": (
+            "You are a senior financial analyst. Using the provided values for gross profit, operational profit, proceed profit, and net profit, "
+            "provide a comprehensive, insightful, and data-driven analysis of the company's profitability. Highlight key trends, strengths, weaknesses, and offer actionable recommendations. "
+            "Present your findings in clear, structured Persian markdown."
+        ),
+        "gross_profit": [],
+        "operational_profit": [],
+        "proceed_profit": [],
+        "net_profit": [],
+    },
+    "cost": {
+        "prompt": (
+            "You are a senior financial analyst. Analyze the company's cost structure using the provided data for consuming material, production fee, construction overhead, production total price, salary fee, and salary production fee. "
+            "Deliver a detailed, insightful, and data-driven assessment, highlighting cost trends, efficiency, and areas for improvement. "
+            "Present your analysis in clear, structured Persian markdown."
+        ),
+        "consuming_material": [],
+        "production_fee": [],
+        "construction_overhead": [],
+        "production_total_price": [],
+        "salary_fee": [],
+        "salary_production_fee": [],
+    },
+    "equity": {
+        "prompt": (
+            "You are a senior financial analyst. Using the provided values for total debt, total equity, and total sum of equity and debt, "
+            "provide a comprehensive, insightful, and data-driven analysis of the company's equity position. Discuss trends, capital structure, and offer actionable recommendations. "
+            "Present your findings in clear, structured Persian markdown."
+        ),
+        "total_debt": [],
+        "total_equity": [],
+        "total_sum_equity_debt": [],
+    },
+    "bankrupsy": {
+        "prompt": (
+            "You are a senior financial analyst. Analyze the company's bankruptcy risk using the provided Altman bankruptcy ratio values. "
+            "Deliver a thorough, insightful, and data-driven assessment, highlighting risk factors, trends, and recommendations for risk mitigation. "
+            "Present your analysis in clear, structured Persian markdown."
+        ),
+        "altman_bankrupsy_ratio": [],
+    },
+    "profitability": {
+        "prompt": (
+            "You are a senior financial analyst. Using the provided values for efficiency, ROA, ROAB, ROE, gross profit margin, and profit margin ratio, "
+            "provide a comprehensive, insightful, and data-driven analysis of the company's profitability. Highlight key trends, strengths, weaknesses, and offer actionable recommendations. "
+            "Present your findings in clear, structured Persian markdown."
+        ),
+        "efficiency": [],
+        "roa": [],
+        "roab": [],
+        "roe": [],
+        "gross_profit_margin": [],
+        "profit_margin_ratio": [],
+    },
+    "salary": {
+        "prompt": (
+            "You are a senior financial analyst. Analyze the company's salary and wage performance using the provided data for construction overhead, production total price, salary fee, and salary production fee. "
+            "Deliver a detailed, insightful, and data-driven assessment, highlighting trends, efficiency, and areas for improvement. "
+            "Present your analysis in clear, structured Persian markdown."
+        ),
+        "construction_overhead": [],
+        "production_total_price": [],
+        "salary_fee": [],
+        "salary_production_fee": [],
+    },
+    "inventory": {
+        "prompt": (
+            "You are a senior financial analyst. Using the provided inventory average values, provide a comprehensive, insightful, and data-driven analysis of the company's inventory management and performance. "
+            "Highlight key trends, strengths, weaknesses, and offer actionable recommendations. "
+            "Present your findings in clear, structured Persian markdown."
+        ),
+        "inventory_average": [],
+    },
+    "agility": {
+        "prompt": (
+            "You are a senior financial analyst. Analyze the company's agility using the provided instant ratio and stock turnover values. "
+            "Deliver a thorough, insightful, and data-driven assessment, highlighting operational flexibility, trends, and recommendations for improvement. "
+            "Present your analysis in clear, structured Persian markdown."
+        ),
+        "instant_ratio": [],
+        "stock_turnover": [],
+    },
+    "liquidity": {
+        "prompt": (
+            "You are a senior financial analyst. Using the provided instant ratio and current ratio values, provide a comprehensive, insightful, and data-driven analysis of the company's liquidity position. "
+            "Highlight key trends, strengths, weaknesses, and offer actionable recommendations. "
+            "Present your findings in clear, structured Persian markdown."
+        ),
+        "instant_ratio": [],
+        "current_ratio": [],
+    },
+    "leverage": {
+        "prompt": (
+            "You are a senior financial analyst. Analyze the company's leverage using the provided values for debt ratio, capital ratio, proprietary ratio, equity per total debt ratio, and equity per total non-current asset ratio. "
+            "Deliver a detailed, insightful, and data-driven assessment, highlighting risk, capital structure, and recommendations for improvement. "
+            "Present your analysis in clear, structured Persian markdown."
+        ),
+        "debt_ratio": [],
+        "capital_ratio": [],
+        "proprietary_ratio": [],
+        "equity_per_total_debt_ratio": [],
+        "equity_per_total_non_current_asset_ratio": [],
+    },
+}
+
+
+def build_analysis_prompt(chart_name: str, financial_data: list[dict]) -> str:
+    """Prompt of ``chart_name`` followed by the chart's series over ``financial_data``."""
+    formatted_prompt = ANALYSIS_CHARTS[chart_name]["prompt"]
+    for field, values in get_chart_series(chart_name, financial_data).items():
+        formatted_prompt += "\n\nData:\n" + (f"{field}: {values}")
+    return formatted_prompt
+
+
+def get_chart_series(chart_name: str, financial_data: list[dict]) -> dict[str, list]:
+    return {
+        field: [float(row[field]) for row in financial_data]
+        for field in ANALYSIS_CHARTS[chart_name]
+        if field != "prompt"
+    }
+
+
+def analysis_cache_key(chart_name: str, financial_data: list[dict]) -> str:
+    """Cache key of a chart's analysis text, hashed from everything the LLM sees."""
+    content = json.dumps(
+        [
+            chart_name,
+            ANALYSIS_PROMPT_VERSION,
+            ANALYSIS_MODEL,
+            get_chart_series(chart_name, financial_data),
+        ]
+    )
+    return f"finance_analysis_text_{hashlib.sha256(content.encode()).hexdigest()}"
+
+
+def count_analysis_cache(hits: int, misses: int):
+    for key, count in (
+        (ANALYSIS_CACHE_HITS_KEY, hits),
+        (ANALYSIS_CACHE_MISSES_KEY, misses),
+    ):
+        if count:
+            cache.add(key, 0, timeout=None)
+            cache.incr(key, count)
+
+
+def get_analysis_cache_stats() -> dict[str, int]:
+    counters = cache.get_many([ANALYSIS_CACHE_HITS_KEY, ANALYSIS_CACHE_MISSES_KEY])
+    return {
+        "hits": counters.get(ANALYSIS_CACHE_HITS_KEY, 0),
+        "misses": counters.get(ANALYSIS_CACHE_MISSES_KEY, 0),
+    }
+
+
+class AnalysisService:
+    """
+    Generate the AnalysisReport texts of a company in one pass.
+
+    The company's FinancialData is loaded once, one prompt is built per chart,
+    the completions run on a bounded thread pool and every report is written
+    with a single bulk upsert on the latest FinancialData row. Texts are cached
+    by a hash of the chart's inputs, so unchanged series skip the LLM call.
+    With ``FINANCE_ANALYSIS_STREAMING`` partial texts are saved while streaming.
+
+    ``client`` is the shared LLM gateway (anything with its ``chat`` signature).
+    """
+
+    def __init__(self, company_id, client):
+        self.company_id = company_id
+        self.client = client
+
+    def load_financial_data(self) -> list[dict]:
+        fields = {
+            field
+            for chart in ANALYSIS_CHARTS.values()
+            for field in chart
+            if field != "prompt"
+        }
+        return list(
+            FinancialData.objects.filter(financial_asset__company__id=self.company_id)
+            .order_by("financial_asset__year", "financial_asset__month")
+            .values("id", "financial_asset__is_tax_record", *sorted(fields))
+        )
+
+    def request_analysis(self, prompt: str, on_delta=None) -> str:
+        options = {"on_delta": on_delta} if on_delta is not None else {}
+        try:
+            response = self.client.chat(
+                model=ANALYSIS_MODEL,
+                messages=[
+                    {"role": "system", "content": SYSTEM_PROMPT},
+                    {"role": "user", "content": prompt},
+                ],
+                **options,
+            )
+        finally:
+            if on_delta is not None:
+                # Partial writes opened a connection in this pool thread
+                connection.close()
+        return response.get("choices", [{}])[0].get("message", "")["content"]
+
+    @staticmethod
+    def stream_writer(calculated_data_id: int, period: str, chart_name: str):
+        """
+        ``on_delta`` callback saving the partial text of ``chart_name``, at most
+        once per ``FINANCE_ANALYSIS_STREAM_INTERVAL`` seconds.
+        """
+        last_write = 0
+
+        def write(text):
+            nonlocal last_write
+            now = time.monotonic()
+            if now - last_write >= settings.FINANCE_ANALYSIS_STREAM_INTERVAL:
+                last_write = now
+                _repo.bulk_upsert_analysis_reports(
+                    calculated_data_id, period, {chart_name: text}
+                )
+
+        return write
+
+    def generate(self, chart_names=None) -> dict[str, str]:
+        """
+        Analyze ``chart_names`` (every chart by default) and return the saved
+        texts by chart name. Charts whose completion fails are logged and skipped.
+        """
+        chart_names = list(chart_names or ANALYSIS_CHARTS)
+        financial_data = self.load_financial_data()
+        if not financial_data:
+            logger.warning(f"No financial data found for company {self.company_id}.")
+            return {}
+
+        logger.info(
+            f"Fetched {len(financial_data)} records for company {self.company_id}."
+        )
+
+        # Charts whose series did not change reuse the stored text
+        cache_keys = {
+            chart_name: analysis_cache_key(chart_name, financial_data)
+            for chart_name in chart_names
+        }
+        cached = cache.get_many(cache_keys.values())
+        texts = {
+            chart_name: cached[cache_key]
+            for chart_name, cache_key in cache_keys.items()
+            if cache_key in cached
+        }
+        prompts = {
+            chart_name: build_analysis_prompt(chart_name, financial_data)
+            for chart_name in chart_names
+            if chart_name not in texts
+        }
+        count_analysis_cache(hits=len(texts), misses=len(prompts))
+
+        last_data = financial_data[-1]
+        period = (
+            AnalysisReport.YEARLY_PERIOD
+            if last_data["financial_asset__is_tax_record"]
+            else AnalysisReport.MONTHLY_PERIOD
+        )
+
+        generated = {}
+        with ThreadPoolExecutor(
+            max_workers=settings.FINANCE_ANALYSIS_CONCURRENCY
+        ) as executor:
+            futures = {
+                chart_name: executor.submit(
+                    self.request_analysis,
+                    prompt,
+                    (
+                        self.stream_writer(last_data["id"], period, chart_name)
+                        if settings.FINANCE_ANALYSIS_STREAMING
+                        else None
+                    ),
+                )
+                for chart_name, prompt in prompts.items()
+            }
+            for chart_name, future in futures.items():
+                try:
+                    texts[chart_name] = generated[chart_name] = future.result()
+                except Exception as e:
+                    logger.error(
+                        f"Analysis failed for company {self.company_id}, chart {chart_name}: {e}"
+                    )
+
+        cache.set_many(
+            {cache_keys[chart_name]: text for chart_name, text in generated.items()},
+            settings.FINANCE_ANALYSIS_CACHE_TIMEOUT,
+        )
+
+        if texts:
+            _repo.bulk_upsert_analysis_reports(last_data["id"], period, texts)
+            # Bulk upserts skip the AnalysisReport receivers
+            clear_chart_cache(self.company_id)
+
+        logger.info(
+            f"Saved {len(texts)}/{len(chart_names)} analysis reports for company "
+            f"{self.company_id} ({len(chart_names) - len(prompts)} from cache)"
+        )
+        return texts
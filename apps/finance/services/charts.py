@@ -0,0 +1,125 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.services.cache_namespace import company_cache
+from apps.finance.repositories import FinanceRepository as _repo
+from apps.finance.serializers import BATCH_CHART_NAMES, CHART_SERIALIZER_MAP
+
+logger = logging.getLogger("finance")
+
+# Cache period name -> ``yearly`` flag of the chart queryset
+CHART_PERIODS = {"yearly": True, "monthly": False}
+
+CHART_TYPES = list(BATCH_CHART_NAMES)
+
+
+def chart_cache_key(company_id, period, chart, version=None):
+    return company_cache.make_key(
+        company_id, f"finance_analysis_chart_{period}_{chart}_{company_id}", version
+    )
+
+
+def real_chart_cache_key(company_id, period, chart, base_year, inflation_version):
+    return f"{chart_cache_key(company_id, period, chart)}_real_{base_year}_{inflation_version}"
+
+
+def clear_chart_cache(company):
+    """Drop the nominal and real-terms chart payloads of both periods."""
+    company_cache.invalidate([company])
+    logger.info("Chart cache cleared for company %s.", company)
+
+
+class ChartPayloadService:
+    """
+    Serialized chart series of a company, materialized per (chart, period).
+
+    Payloads are read through the cache and rebuilt by ``warm()`` after a
+    recompute; they live in the company cache namespace, so the FinancialData
+    and AnalysisReport receivers drop them with one version bump.
+    """
+
+    def __init__(self, company):
+        self.company = company
+
+    def get_payload(self, chart: str, yearly: bool) -> list:
+        period = "yearly" if yearly else "monthly"
+        cache_key = chart_cache_key(self.company.id, period, chart)
+        payload = cache.get(cache_key)
+        if payload is None:
+            payload = self.build_payload(chart, yearly)
+            cache.set(cache_key, payload, settings.FINANCE_CHART_CACHE_TIMEOUT)
+            logger.debug("Chart payload cached: %s", cache_key)
+        return payload
+
+    def build_payload(self, chart: str, yearly: bool) -> list:
+        return self.build_payloads([chart], yearly)[chart]
+
+    def get_payloads(
+        self, charts: list, yearly: bool, version: int | None = None
+    ) -> dict[str, list]:
+        """Payloads of several charts; the missing ones share one FinancialData load."""
+        period = "yearly" if yearly else "monthly"
+        if version is None:
+            version = company_cache.get_version(self.company.id)
+        cache_keys = {
+            chart: chart_cache_key(self.company.id, period, chart, version)
+            for chart in charts
+        }
+        cached = cache.get_many(cache_keys.values())
+
+        missing = [chart for chart in charts if cache_keys[chart] not in cached]
+        if missing:
+            built = self.build_payloads(missing, yearly)
+            cache.set_many(
+                {cache_keys[chart]: payload for chart, payload in built.items()},
+                settings.FINANCE_CHART_CACHE_TIMEOUT,
+            )
+            cached.update(
+                {cache_keys[chart]: payload for chart, payload in built.items()}
+            )
+
+        return {chart: cached[cache_keys[chart]] for chart in charts}
+
+    def build_payloads(self, charts: list, yearly: bool) -> dict[str, list]:
+        """Serialize several charts from one FinancialData query and one report query."""
+        serializer_classes = {chart: CHART_SERIALIZER_MAP[chart] for chart in charts}
+        financial_data = list(
+            _repo.get_financial_charts_for_company(
+                self.company,
+                yearly,
+                {
+                    serializer_class.chart_name
+                    for serializer_class in serializer_classes.values()
+                },
+            )
+        )
+        reports = {item.id: item.chart_reports for item in financial_data}
+
+        payloads = {}
+        for chart, serializer_class in serializer_classes.items():
+            for item in financial_data:
+                item.chart_reports = [
+                    report
+                    for report in reports[item.id]
+                    if report.chart_name == serializer_class.chart_name
+                ]
+            payloads[chart] = list(serializer_class(financial_data, many=True).data)
+        return payloads
+
+    def warm(self):
+        """Build and cache every chart payload of both periods."""
+        version = company_cache.get_version(self.company.id)
+        payloads = {}
+        for period, yearly in CHART_PERIODS.items():
+            for chart, payload in self.build_payloads(CHART_TYPES, yearly).items():
+                payloads[chart_cache_key(self.company.id, period, chart, version)] = (
+                    payload
+                )
+        cache.set_many(payloads, settings.FINANCE_CHART_CACHE_TIMEOUT)
+        logger.info(
+            "Chart payloads built for company %s (%d charts)",
+            self.company.id,
+            len(payloads),
+        )
@@ -0,0 +1,287 @@
+import logging
+from decimal import Decimal
+
+import numpy as np
+
+from apps.finance.services.loader import FinancialStatementLoader
+
+logger = logging.getLogger("finance")
+
+
+# Result key -> source field, per statement model. Missing statements yield 0.
+BALANCE_REPORT_COLUMNS = {
+    "current_asset": "total_current_asset",
+    "non_current_asset": "total_non_current_asset",
+    "current_debt": "total_current_debt",
+    "non_current_debt": "total_non_current_debt",
+    "ownership_right_total": "ownership_right_total",
+    "net_sale": "net_sale",
+    "net_profit": "net_profit",
+    "accumulated_profit": "accumulated_profit_loss",
+    "trade_payable": "trade_payable",
+    "advance": "advance",
+    "reserves": "reserves",
+    "long_term_payable": "long_term_payable",
+    "employee_termination_benefit_reserve": "employee_termination_benefit_reserve",
+    "first_period_inventory": "first_period_inventory",
+    "end_period_inventory": "end_period_inventory",
+}
+
+PROFIT_LOSS_STATEMENT_COLUMNS = {
+    "operational_profit": "operational_profit",
+    "gross_profit": "gross_profit",
+    "proceed_profit": "proceed_profit",
+    "salary_fee": "salary_fee",
+    "operational_income_expense": "operational_income_expense",
+    "marketing_fee": "marketing_fee",
+}
+
+SOLD_PRODUCT_COLUMNS = {
+    "consuming_material": "consuming_material",
+    "construction_overhead": "construction_overhead",
+    "production_total_price": "production_total_price",
+    "direct_wage": "direct_wage",
+    "sold_product_total_fee": "sold_product_total_price",
+}
+
+
+def safe_divide(numerator, denominator):
+    """Element-wise ``numerator / denominator`` that yields 0 where the denominator is 0."""
+    result = np.zeros(len(denominator), dtype=object)
+    mask = denominator != 0
+    result[mask] = numerator[mask] / denominator[mask]
+    return result
+
+
+class FinancialCalculationEngine:
+    """
+    Statement rows are loaded into one column per field in a single pass and
+    every ratio is evaluated as one whole-column expression.
+
+    The columns are ``dtype=object`` arrays of ``Decimal``, so numpy still runs
+    the arithmetic element by element and the results are exact. Converting the
+    amounts to float64 and the ratios back to the two-place ``Decimal`` that
+    FinancialData stores costs more than the float64 arithmetic saves.
+
+    ``series_totals`` enables the incremental mode: when only some periods are
+    passed in, it holds the ``(sum, count)`` of the ``inventory`` and
+    ``total_asset`` series over the periods left out, so the whole-series means
+    still cover every period of the company.
+
+    ``statements`` may hold rows already loaded by ``FinancialStatementLoader``;
+    otherwise they are fetched with one query per statement table.
+    """
+
+    STATEMENT_COLUMNS = {
+        "balance_reports": BALANCE_REPORT_COLUMNS,
+        "profit_loss_statements": PROFIT_LOSS_STATEMENT_COLUMNS,
+        "sold_product_fees": SOLD_PRODUCT_COLUMNS,
+    }
+
+    def __init__(self, financial_assets, series_totals=None, statements=None):
+        self.financial_assets = financial_assets
+        self.length = len(self.financial_assets)
+        self.series_totals: dict[str, tuple] = series_totals or {}
+        self.statements = statements
+        self.columns: dict[str, np.ndarray] = {}
+        self.has_balance_report = np.zeros(self.length, dtype=bool)
+        self.series: dict[str, np.ndarray] = {}
+        self.series_means: dict[str, object] = {}
+
+        logger.info(
+            "Initializing FinancialCalculationEngine with %d financial assets",
+            self.length,
+        )
+
+        self.process_assets()
+
+    def load_columns(self):
+        """Read the balance, profit/loss and sold product rows of each asset once."""
+        statements = self.statements
+        if statements is None:
+            statements = FinancialStatementLoader(
+                [asset.id for asset in self.financial_assets],
+                {
+                    related_name: list(mapping.values())
+                    for related_name, mapping in self.STATEMENT_COLUMNS.items()
+                },
+            ).load()
+
+        raw = {
+            key: [] for mapping in self.STATEMENT_COLUMNS.values() for key in mapping
+        }
+
+        for i, asset in enumerate(self.financial_assets):
+            for related_name, mapping in self.STATEMENT_COLUMNS.items():
+                row = statements[related_name].get(asset.id)
+                if related_name == "balance_reports":
+                    self.has_balance_report[i] = row is not None
+                if row is None:
+                    logger.warning("Missing %s for asset %d", related_name, i + 1)
+                    row = {}
+                for key, field in mapping.items():
+                    raw[key].append(row.get(field, 0))
+
+        for key, values in raw.items():
+            column = np.empty(self.length, dtype=object)
+            column[:] = values
+            self.columns[key] = column
+
+    def process_assets(self):
+        try:
+            logger.info("Starting to process %d financial assets", self.length)
+            self.load_columns()
+            self.process_ratios()
+            logger.info("Finished processing financial assets successfully")
+        except Exception as e:
+            logger.error("Error occurred while processing assets: %s", e, exc_info=True)
+            return {"status": "failed", "data": {}}
+
+    def process_ratios(self):
+        c = self.columns
+        s = self.series
+
+        s["total_asset"] = c["non_current_asset"] + c["current_asset"]
+        s["total_debt"] = c["non_current_debt"] + c["current_debt"]
+        s["inventory"] = np.where(
+            self.has_balance_report,
+            (c["first_period_inventory"] + c["end_period_inventory"]) / 2,
+            0,
+        )
+
+        total_asset = s["total_asset"]
+        total_debt = s["total_debt"]
+        equity = c["ownership_right_total"]
+
+        s["usability"] = safe_divide(c["net_profit"], c["net_sale"])
+        s["efficiency"] = safe_divide(c["net_sale"], total_asset)
+        s["roa"] = safe_divide(c["net_profit"], total_asset)
+        s["roab"] = s["usability"] * s["efficiency"]
+        s["roe"] = safe_divide(c["net_profit"], equity)
+        s["gross_profit_margin_ratio"] = safe_divide(c["gross_profit"], c["net_sale"])
+        s["net_profit_margin_ratio"] = safe_divide(c["net_profit"], c["net_sale"])
+        s["debt_ratio"] = safe_divide(total_debt, total_asset)
+        s["capital_ratio"] = safe_divide(c["net_profit"], equity)
+        s["total_debt_to_proceed_profit_ratio"] = safe_divide(
+            total_debt, c["proceed_profit"]
+        )
+        s["current_debt_to_proceed_profit_ratio"] = safe_divide(
+            c["current_debt"], c["proceed_profit"]
+        )
+        s["proprietary_ratio"] = safe_divide(c["proceed_profit"], total_asset)
+        s["equity_per_total_debt_ratio"] = safe_divide(total_debt, equity)
+        s["current_ratio"] = safe_divide(c["current_asset"], c["current_debt"])
+        s["instant_ratio"] = safe_divide(
+            c["current_asset"] - s["inventory"], c["current_debt"]
+        )
+        s["salary_production_fee"] = c["direct_wage"] + c["salary_fee"]
+        s["capital_to_asset_ratio"] = safe_divide(
+            c["current_asset"] - c["current_debt"], total_asset
+        )
+        s["accumulated_profit_to_asset_ratio"] = safe_divide(
+            c["accumulated_profit"], total_asset
+        )
+        s["before_tax_profit_to_asset_ratio"] = safe_divide(
+            c["proceed_profit"], total_asset
+        )
+        s["sale_to_asset_ratio"] = safe_divide(c["net_sale"], total_asset)
+        s["equity_per_total_non_current_asset_ratio"] = safe_divide(
+            equity, c["non_current_asset"]
+        )
+        s["altman_bankrupsy_ratio"] = (
+            (Decimal(1.2) * s["capital_to_asset_ratio"])
+            + (Decimal(1.4) * s["accumulated_profit_to_asset_ratio"])
+            + (Decimal(3.3) * s["before_tax_profit_to_asset_ratio"])
+            + (Decimal(0.6) * s["equity_per_total_debt_ratio"])
+            + (Decimal(0.999) * s["sale_to_asset_ratio"])
+        )
+        s["equity_to_debt_ratio"] = safe_divide(equity, total_debt)
+        s["total_sum_equity_debt"] = equity + total_debt
+        s["total_asset_turnover_ratio"] = self.mean_ratio(
+            c["net_sale"], total_asset, "total_asset"
+        )
+        s["stock_turnover"] = self.mean_ratio(
+            c["sold_product_total_fee"], s["inventory"], "inventory"
+        )
+
+        logger.info("Financial ratio calculations completed")
+
+    def mean_ratio(self, values, series, name):
+        """Divide ``values`` by the mean of the whole ``series`` (0 when the mean is 0)."""
+        total, count = self.series_totals.get(name, (0, 0))
+        if count:
+            mean = (total + sum(series.tolist())) / (count + self.length)
+        elif self.length:
+            mean = np.mean(series.tolist())
+        else:
+            mean = 0
+        self.series_means[name] = mean
+
+        if mean == 0:
+            return np.zeros(self.length, dtype=object)
+        return values / mean
+
+    def get_results(self):
+        """Return the final processed financial data"""
+
+        logger.info("Generating results for financial calculations")
+
+        c = self.columns
+        s = self.series
+        if not s:
+            return {"status": "failed", "data": {}}
+
+        data = {
+            "current_asset": c["current_asset"],
+            "non_current_asset": c["non_current_asset"],
+            "total_asset": s["total_asset"],
+            "current_debt": c["current_debt"],
+            "non_current_debt": c["non_current_debt"],
+            "total_debt": s["total_debt"],
+            "total_equity": c["ownership_right_total"],
+            "net_sale": c["net_sale"],
+            "inventory": s["inventory"],
+            "net_profit": c["net_profit"],
+            "trade_payable": c["trade_payable"],
+            "advance": c["advance"],
+            "reserves": c["reserves"],
+            "long_term_payable": c["long_term_payable"],
+            "employee_termination_benefit_reserve": c[
+                "employee_termination_benefit_reserve"
+            ],
+            "total_sum_equity_debt": s["total_sum_equity_debt"],
+            "gross_profit": c["gross_profit"],
+            "operational_income_expense": c["operational_income_expense"],
+            "marketing_fee": c["marketing_fee"],
+            "operational_profit": c["operational_profit"],
+            "proceed_profit": c["proceed_profit"],
+            "consuming_material": c["consuming_material"],
+            "production_fee": c["direct_wage"],
+            "construction_overhead": c["construction_overhead"],
+            "production_total_price": c["production_total_price"],
+            "salary_fee": c["salary_fee"],
+            "salary_production_fee": s["salary_production_fee"],
+            "usability": s["usability"],
+            "efficiency": s["efficiency"],
+            "roa": s["roa"],
+            "roab": s["roab"],
+            "roe": s["roe"],
+            "gross_profit_margin": s["gross_profit_margin_ratio"],
+            "profit_margin_ratio": s["net_profit_margin_ratio"],
+            "debt_ratio": s["debt_ratio"],
+            "capital_ratio": s["capital_ratio"],
+            "proprietary_ratio": s["proprietary_ratio"],
+            "equity_per_total_debt_ratio": s["equity_per_total_debt_ratio"],
+            "equity_per_total_non_current_asset_ratio": s[
+                "equity_per_total_non_current_asset_ratio"
+            ],
+            "current_ratio": s["current_ratio"],
+            "instant_ratio": s["instant_ratio"],
+            "stock_turnover": s["stock_turnover"],
+            "altman_bankrupsy_ratio": s["altman_bankrupsy_ratio"],
+        }
+
+        return {
+            "status": "success",
+            "data": {key: column.tolist() for key, column in data.items()},
+        }
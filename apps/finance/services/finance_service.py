@@ -1,6 +1,52 @@
 # from django.core.cache import cache
+import logging
 
+import numpy as np
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.services.cache_namespace import company_cache
+from apps.finance.events import company_financials_refreshed
+from apps.finance.models import FinancialData
 from apps.finance.repositories import FinanceRepository as _repo
+from apps.finance.services.engine import FinancialCalculationEngine
+from apps.finance.services.inflation import InflationTable
+
+logger = logging.getLogger("finance")
+
+# Keys of the calculation results whose FinancialData field is named differently
+RESULT_FIELD_NAMES = {"inventory": "inventory_average"}
+
+# FinancialData fields holding amounts of money; every other field is a ratio
+MONETARY_FIELDS = [
+    "current_asset",
+    "non_current_asset",
+    "total_asset",
+    "current_debt",
+    "non_current_debt",
+    "total_debt",
+    "total_equity",
+    "total_sum_equity_debt",
+    "gross_profit",
+    "net_sale",
+    "operational_income_expense",
+    "marketing_fee",
+    "inventory_average",
+    "operational_profit",
+    "proceed_profit",
+    "net_profit",
+    "consuming_material",
+    "production_fee",
+    "construction_overhead",
+    "production_total_price",
+    "salary_fee",
+    "salary_production_fee",
+    "trade_payable",
+    "advance",
+    "reserves",
+    "long_term_payable",
+    "employee_termination_benefit_reserve",
+]
 
 
 class FinanceService:
@@ -26,3 +72,177 @@ class FinanceService:
         }
 
         return result
+
+    @staticmethod
+    def deflate_financial_data(financial_data, base_year: int):
+        """
+        Express the monetary fields of ``financial_data`` in ``base_year`` money.
+
+        The CPI of every row's year is looked up once from the in-process
+        inflation table and each field is converted as one series. Instances are
+        updated in memory only. Raises ``ValueError`` when a CPI value is missing.
+        """
+        financial_data = list(financial_data)
+        if not financial_data:
+            return financial_data
+
+        cpi_ratio = InflationTable.get_cpi_ratio(
+            [item.financial_asset.year for item in financial_data], base_year
+        )
+        for field in MONETARY_FIELDS:
+            amounts = np.empty(len(financial_data), dtype=object)
+            amounts[:] = [getattr(item, field) for item in financial_data]
+            values = amounts * cpi_ratio
+            for item, value in zip(financial_data, values):
+                setattr(item, field, value)
+        return financial_data
+
+    @staticmethod
+    def publish_financial_data(queryset) -> int:
+        """
+        Publish the unpublished FinancialData of ``queryset`` with one UPDATE.
+
+        ``update()`` runs no lifecycle hooks or post_save receivers, so the
+        affected companies' caches are invalidated here and after the commit a
+        single ``company_financials_refreshed`` is sent per company: one chart
+        rebuild and analysis job each. Returns the number of rows published.
+        """
+        rows = list(
+            queryset.filter(is_published=False).values_list(
+                "id", "financial_asset__company_id"
+            )
+        )
+        if not rows:
+            return 0
+
+        companies = {}
+        for financial_data_id, company_id in rows:
+            companies.setdefault(company_id, []).append(financial_data_id)
+
+        updated_count = FinancialData.objects.filter(
+            id__in=[financial_data_id for financial_data_id, _ in rows]
+        ).update(is_published=True, updated_at=timezone.now())
+        company_cache.invalidate(companies)
+
+        def notify():
+            for company_id, financial_data_ids in companies.items():
+                company_financials_refreshed.send(
+                    sender=FinancialData,
+                    company_id=company_id,
+                    financial_data_ids=financial_data_ids,
+                )
+
+        transaction.on_commit(notify)
+        logger.info(
+            "Published %d FinancialData rows of %d companies",
+            updated_count,
+            len(companies),
+        )
+        return updated_count
+
+    def refresh_financial_data(self, asset_ids=None):
+        """
+        Recalculate the company's tax-record assets and write the results with
+        one bulk upsert, invalidate the company's caches and send a single
+        ``company_financials_refreshed`` after the commit.
+
+        When ``asset_ids`` is given only those periods are recalculated; the
+        whole-series means are completed from the stored FinancialData of the
+        other periods, whose ``stock_turnover`` is then patched in bulk. Falls
+        back to a full refresh when the stored rows do not cover every period.
+        """
+        financial_assets = _repo.get_tax_financial_assets_for_company(self.company)
+        series_totals = None
+        if asset_ids is not None:
+            series_totals = self.get_series_totals(financial_assets, asset_ids)
+            if series_totals is not None:
+                financial_assets = financial_assets.filter(id__in=asset_ids)
+
+        engine = FinancialCalculationEngine(financial_assets, series_totals)
+        results = engine.get_results()
+
+        if results["status"] != "success":
+            logger.error(
+                "Financial calculations failed for company %s", self.company.id
+            )
+            return []
+
+        data = results["data"]
+        rows = {
+            asset.id: {
+                "is_published": False,
+                **{
+                    RESULT_FIELD_NAMES.get(key, key): values[idx]
+                    for key, values in data.items()
+                },
+            }
+            for idx, asset in enumerate(financial_assets)
+        }
+
+        with transaction.atomic():
+            financial_data = _repo.bulk_upsert_financial_data(rows)
+            if series_totals is not None:
+                self.patch_stock_turnover(
+                    series_totals["asset_ids"], engine.series_means["inventory"]
+                )
+            company_cache.invalidate([self.company.id])
+
+        financial_data_ids = [item.id for item in financial_data]
+        logger.info(
+            "FinancialData refreshed for company %s (%d rows, %s)",
+            self.company.id,
+            len(financial_data_ids),
+            "incremental" if series_totals is not None else "full",
+        )
+
+        company_id = self.company.id
+        transaction.on_commit(
+            lambda: company_financials_refreshed.send(
+                sender=FinancialData,
+                company_id=company_id,
+                financial_data_ids=financial_data_ids,
+            )
+        )
+        return financial_data
+
+    def get_series_totals(self, financial_assets, asset_ids):
+        """
+        Stored ``(sum, count)`` of the mean-based series over the periods that are
+        not recalculated, or ``None`` if those periods lack exactly one FinancialData.
+        """
+        other_asset_ids = list(
+            financial_assets.exclude(id__in=asset_ids).values_list("id", flat=True)
+        )
+        totals = _repo.get_financial_series_totals(self.company, asset_ids)
+        if totals["rows"] != len(other_asset_ids) or totals["assets"] != len(
+            other_asset_ids
+        ):
+            logger.info(
+                "Stored FinancialData incomplete for company %s, running a full refresh",
+                self.company.id,
+            )
+            return None
+
+        count = len(other_asset_ids)
+        return {
+            "asset_ids": other_asset_ids,
+            "inventory": (totals["inventory"] or 0, count),
+            "total_asset": (totals["total_asset"] or 0, count),
+        }
+
+    def patch_stock_turnover(self, asset_ids, inventory_mean):
+        """Rescale ``stock_turnover`` of untouched periods to the new inventory mean."""
+        if not asset_ids:
+            return
+        sold_product_totals = _repo.get_sold_product_totals(asset_ids)
+        _repo.bulk_update_financial_data_field(
+            "stock_turnover",
+            {
+                asset_id: (
+                    sold_product_totals.get(asset_id, 0) / inventory_mean
+                    if inventory_mean != 0
+                    else 0
+                )
+                for asset_id in asset_ids
+            },
+        )
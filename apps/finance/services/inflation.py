@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
+
+from apps.finance.models import Inflation
+
+logger = logging.getLogger("finance")
+
+INFLATION_TABLE_VERSION_KEY = "finance_inflation_table_version"
+
+
+class InflationTable:
+    """
+    In-process copy of the ``Inflation`` table, loaded with one query and reused
+    until its version changes.
+
+    The version is kept in the shared cache, so ``invalidate()`` called by the
+    admin or ``load_inflation_values`` refreshes the copy held by every worker.
+    """
+
+    _lock = threading.Lock()
+    _version = None
+    _cpi: dict[int, Decimal] = {}
+    _inflation_rate: dict[int, Decimal] = {}
+
+    @staticmethod
+    def get_version():
+        version = cache.get(INFLATION_TABLE_VERSION_KEY)
+        if version is None:
+            cache.add(INFLATION_TABLE_VERSION_KEY, time.time_ns(), timeout=None)
+            version = cache.get(INFLATION_TABLE_VERSION_KEY)
+        return version
+
+    @classmethod
+    def invalidate(cls):
+        """Bump the shared version so every process reloads the table on next use."""
+        cache.set(INFLATION_TABLE_VERSION_KEY, time.time_ns(), timeout=None)
+        with cls._lock:
+            cls._version = None
+        logger.info("Inflation table invalidated")
+
+    @classmethod
+    def load(cls):
+        version = cls.get_version()
+        if version is not None and version == cls._version:
+            return
+
+        with cls._lock:
+            if version is not None and version == cls._version:
+                return
+            cpi, inflation_rate = {}, {}
+            for year, cpi_value, rate in Inflation.objects.values_list(
+                "year", "cpi_value", "inflation_rate"
+            ):
+                cpi[year] = cpi_value
+                inflation_rate[year] = rate
+            cls._cpi, cls._inflation_rate = cpi, inflation_rate
+            cls._version = version
+        logger.debug("Inflation table loaded with %d years", len(cpi))
+
+    @classmethod
+    def get_years(cls) -> list[int]:
+        cls.load()
+        return list(cls._cpi)
+
+    @classmethod
+    def lookup(cls, table: dict, years, error_message: str) -> np.ndarray:
+        try:
+            if np.ndim(years) == 0:
+                return np.array(table[int(years)], dtype=object)
+            values = np.empty(len(years), dtype=object)
+            values[:] = [table[int(year)] for year in years]
+            return values
+        except KeyError:
+            raise ValueError(error_message)
+
+    @classmethod
+    def get_cpi(cls, years) -> np.ndarray:
+        cls.load()
+        return cls.lookup(cls._cpi, years, "CPI values not found for the given years")
+
+    @classmethod
+    def get_inflation_rate(cls, years) -> np.ndarray:
+        cls.load()
+        return cls.lookup(
+            cls._inflation_rate, years, "Inflation Rate not found for the given years"
+        )
+
+    @classmethod
+    def convert_with_cpi(cls, amounts, from_years, to_year) -> np.ndarray:
+        """
+        Current value of ``amounts`` in ``to_year`` using the CPI ratio.
+
+        ``amounts`` may be a single amount or a series; ``from_years`` is either
+        one year for the whole series or one year per amount.
+        """
+        return np.asarray(amounts, dtype=object) * cls.get_cpi_ratio(
+            from_years, to_year
+        )
+
+    @classmethod
+    def get_cpi_ratio(cls, from_years, to_year) -> np.ndarray:
+        """``CPI(to_year) / CPI(year)`` for each of ``from_years``."""
+        from_year_cpi = cls.get_cpi(from_years)
+        to_year_cpi = cls.get_cpi(to_year)
+        return to_year_cpi / from_year_cpi
+
+    @classmethod
+    def convert_with_inflation_ratio(cls, amounts, from_years) -> np.ndarray:
+        """Value of ``amounts`` after one year of inflation at ``from_years``' rate."""
+        from_year_inflation_rate = cls.get_inflation_rate(from_years)
+        return (
+            np.asarray(amounts, dtype=object)
+            * (Decimal(100) + from_year_inflation_rate)
+        ) / 100
@@ -0,0 +1,71 @@
+import logging
+
+from apps.finance.models import (
+    AccountTurnOver,
+    BalanceReport,
+    ProfitLossStatement,
+    SoldProductFee,
+)
+
+logger = logging.getLogger("finance")
+
+
+class FinancialStatementLoader:
+    """
+    Load the statement rows of many financial assets with one ``values()`` query
+    per statement table and join them in memory by ``financial_asset_id``.
+
+    Like ``asset.<related_name>.first()``, the row with the lowest id is kept
+    when an asset has several rows of the same statement.
+    """
+
+    STATEMENT_MODELS = {
+        "balance_reports": BalanceReport,
+        "profit_loss_statements": ProfitLossStatement,
+        "sold_product_fees": SoldProductFee,
+        "account_turnovers": AccountTurnOver,
+    }
+
+    def __init__(self, asset_ids, statements=None):
+        """
+        Args:
+            asset_ids: ids of the financial assets to load.
+            statements: mapping of related name -> field names to read, defaults
+                to every field of all four statement tables.
+        """
+        self.asset_ids = list(asset_ids)
+        self.statements = statements or {
+            related_name: None for related_name in self.STATEMENT_MODELS
+        }
+
+    def load(self) -> dict[str, dict[int, dict]]:
+        """Return ``{related_name: {financial_asset_id: row}}``."""
+        loaded = {}
+        for related_name, fields in self.statements.items():
+            loaded[related_name] = self.load_statement(related_name, fields)
+        logger.debug(
+            "Loaded %s for %d financial assets",
+            ", ".join(loaded),
+            len(self.asset_ids),
+        )
+        return loaded
+
+    def load_statement(self, related_name, fields=None) -> dict[int, dict]:
+        model = self.STATEMENT_MODELS[related_name]
+        if fields is None:
+            fields = [
+                field.attname
+                for field in model._meta.concrete_fields
+                if field.name not in ("id", "financial_asset")
+            ]
+
+        rows = {}
+        if not self.asset_ids:
+            return rows
+        for row in (
+            model.objects.filter(financial_asset_id__in=self.asset_ids)
+            .order_by("financial_asset_id", "id")
+            .values("financial_asset_id", *fields)
+        ):
+            rows.setdefault(row.pop("financial_asset_id"), row)
+        return rows
@@ -0,0 +1,93 @@
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.services.cache_namespace import company_cache
+from apps.finance.models import FinancialData
+
+logger = logging.getLogger("finance")
+
+# Series name -> FinancialData field it is read from
+FINANCIAL_SERIES_FIELDS = {
+    "net_sale": "net_sale",
+    "non_current_asset": "non_current_asset",
+    "current_asset": "current_asset",
+    "total_asset": "total_asset",
+    "non_current_debt": "non_current_debt",
+    "current_debt": "current_debt",
+    "total_debt": "total_debt",
+    "altman_bankrupsy_ratio": "altman_bankrupsy_ratio",
+    "total_equity": "total_equity",
+    "total_sum_equity_debt": "total_sum_equity_debt",
+    "inventory": "inventory_average",
+    "salary_fee": "salary_fee",
+    "production_fee": "production_fee",
+    "salary_production_fee": "salary_production_fee",
+    "roa": "roa",
+    "roab": "roab",
+    "roe": "roe",
+    "usability": "usability",
+    "efficiency": "efficiency",
+    "gross_profit_margin": "gross_profit_margin",
+    "profit_margin_ratio": "profit_margin_ratio",
+    "debt_ratio": "debt_ratio",
+    "capital_ratio": "capital_ratio",
+    "proprietary_ratio": "proprietary_ratio",
+    "equity_per_total_debt_ratio": "equity_per_total_debt_ratio",
+    "equity_per_total_non_current_asset_ratio": "equity_per_total_non_current_asset_ratio",
+    "instant_ratio": "instant_ratio",
+    "current_ratio": "current_ratio",
+    "stock_turnover": "stock_turnover",
+    "gross_profit": "gross_profit",
+    "operational_profit": "operational_profit",
+    "proceed_profit": "proceed_profit",
+    "net_profit": "net_profit",
+    "construction_overhead": "construction_overhead",
+    "consuming_material": "consuming_material",
+    "production_total_price": "production_total_price",
+}
+
+
+def financial_series_cache_key(company_id):
+    return company_cache.make_key(
+        company_id, f"company_admin_financial_data_{company_id}"
+    )
+
+
+def get_financial_series(company_id) -> dict[str, list]:
+    """
+    Every financial series of a company as columns of floats, in period order.
+
+    The columns are built from one ``values_list`` query and cached in the
+    company cache namespace for ``FINANCE_SERIES_CACHE_TIMEOUT``; refreshing or
+    publishing the company's FinancialData bumps the namespace earlier.
+    ``year`` and ``month`` (``""`` for yearly rows) label the periods.
+    """
+    cache_key = financial_series_cache_key(company_id)
+    series = cache.get(cache_key)
+    if series is not None:
+        return series
+
+    rows = (
+        FinancialData.objects.filter(financial_asset__company_id=company_id)
+        .order_by("financial_asset__year", "financial_asset__month")
+        .values_list(
+            "financial_asset__year",
+            "financial_asset__month",
+            *FINANCIAL_SERIES_FIELDS.values(),
+        )
+    )
+    columns = list(zip(*rows)) or [()] * (len(FINANCIAL_SERIES_FIELDS) + 2)
+    year, month, *values = columns
+
+    series = {
+        "year": [float(value) for value in year],
+        "month": [float(value) if value else "" for value in month],
+    }
+    for name, column in zip(FINANCIAL_SERIES_FIELDS, values):
+        series[name] = [float(value or 0) for value in column]
+
+    cache.set(cache_key, series, settings.FINANCE_SERIES_CACHE_TIMEOUT)
+    logger.debug("Financial series cached: %s", cache_key)
+    return series
@@ -1,66 +1,12 @@
 import logging
+import time
 from math import log2
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 
-import pandas as pd
+import numpy as np
 from django.utils.translation import gettext_lazy as _
-
-from apps.finance.services.functions import (
-    accumulated_profit_function,
-    accumulated_profit_to_asset_ratio_function,
-    advance_function,
-    altman_bankruptcy_ratio_function,
-    before_tax_profit_to_asset_ratio_function,
-    capital_ratio_function,
-    capital_to_asset_ratio_function,
-    construction_overhead_function,
-    consuming_material_function,
-    current_asset_function,
-    current_debt_function,
-    current_debt_to_proceed_profit_ratio_function,
-    current_ratio_function,
-    debt_ratio_function,
-    direct_wage_function,
-    efficiency_function,
-    employee_termination_benefit_reserve_function,
-    equity_per_total_debt_ratio_function,
-    equity_per_total_non_current_asset_ratio_function,
-    equity_to_debt_ratio_function,
-    gross_profit_function,
-    gross_profit_margin_ratio_function,
-    instant_ratio_function,
-    inventory_function,
-    long_term_payable_function,
-    marketing_fee_function,
-    net_profit_function,
-    net_profit_margin_ratio_function,
-    net_sale_function,
-    non_current_asset_function,
-    non_current_debt_function,
-    operational_income_expense_function,
-    operational_profit_function,
-    ownership_right_total_function,
-    proceed_profit_function,
-    production_total_price_function,
-    properitary_ratio_function,
-    reserves_function,
-    roa_function,
-    roab_function,
-    roe_function,
-    salary_fee_function,
-    salary_production_fee_function,
-    sale_to_asset_ratio_function,
-    sold_product_total_fee_function,
-    stock_turn_over_ratio_function,
-    total_asset_function,
-    total_asset_turnover_ratio_function,
-    total_debt_function,
-    total_debt_to_proceed_profit_ratio_function,
-    total_sum_equity_debt_function,
-    trade_payable_function,
-    usability_function,
-)
+from openpyxl import load_workbook
 
 logger = logging.getLogger("finance")
 
@@ -101,312 +47,143 @@ def get_life_cycle(company):
     return life_cycle_stage, x_vals, y_vals
 
 
-class FinancialCalculations:
-    def __init__(self, financial_assets):
-        logger.info(
-            "Initializing FinancialCalculations with %d financial assets",
-            len(financial_assets),
-        )
-
-        self.financial_assets = financial_assets
-        self.length = len(self.financial_assets)
-        self.year = []
-        self.month = []
-
-        self.balance_report_values: dict[str, List] = {
-            "current_asset": [],
-            "non_current_asset": [],
-            "total_asset": [],
-            "current_debt": [],
-            "non_current_debt": [],
-            "total_debt": [],
-            "inventory": [],
-            "net_sale": [],
-            "net_profit": [],
-            "accumulated_profit": [],
-            "ownership_right_total": [],
-            "trade_payable": [],
-            "advance": [],
-            "reserves": [],
-            "long_term_payable": [],
-            "employee_termination_benefit_reserve": [],
-        }
-
-        self.profit_loss_statement_values: dict[str, List] = {
-            "operational_profit": [],
-            "gross_profit": [],
-            "proceed_profit": [],
-            "salary_fee": [],
-            "operational_income_expense": [],
-            "marketing_fee": [],
-        }
-
-        self.sold_product_values: dict[str, List] = {
-            "consuming_material": [],
-            "construction_overhead": [],
-            "production_total_price": [],
-            "direct_wage": [],
-            "sold_product_total_fee": [],
-        }
-
-        self.gross_profit_margin_ratio = []
-        self.net_profit_margin_ratio = []
-        self.total_sum_equity_debt = []
-        self.salary_production_fee = []
-        self.equity_per_total_debt_ratio = []
-        self.equity_per_total_non_current_asset_ratio = []
-        self.usability = []
-        self.efficiency = []
-        self.roa = []
-        self.roab = []
-        self.roe = []
-        self.debt_ratio = []
-        self.capital_ratio = []
-        self.total_debt_to_proceed_profit_ratio = []
-        self.current_debt_to_proceed_profit_ratio = []
-        self.proprietary_ratio = []
-        self.current_ratio = []
-        self.instant_ratio = []
-        self.total_asset_turnover_ratio = []
-        self.stock_turnover = []
-        self.capital_to_asset_ratio = []
-        self.accumulated_profit_to_asset_ratio = []
-        self.before_tax_profit_to_asset_ratio = []
-        self.equity_to_debt_ratio = []
-        self.sale_to_asset_ratio = []
-        self.altman_bankrupsy_ratio = []
-
-        self.process_assets()
-
-    def process_assets(self):
-        try:
-            logger.info("Starting to process %d financial assets", self.length)
-
-            for i in range(self.length):
-                logger.debug("Processing financial asset %d/%d", i + 1, self.length)
-                asset = self.financial_assets[i]
-
-                account_turnover = asset.account_turnovers.first()  # noqa: F841
-                balance_report = asset.balance_reports.first()
-                sold_product_fee = asset.sold_product_fees.first()
-                profit_loss_statement = asset.profit_loss_statements.first()
-
-                if (
-                    not balance_report
-                    or not profit_loss_statement
-                    or not sold_product_fee
-                ):
-                    logger.warning("Missing data for asset %d", i + 1)
-
-                self.process_balance_report(balance_report)
-
-                self.process_profit_loss_statement(profit_loss_statement)
-
-                self.process_sold_product_fee(sold_product_fee)
-
-            self.process_ratios()
-            logger.info("Finished processing financial assets successfully")
-
-        except Exception as e:
-            logger.error("Error occurred while processing assets: %s", e, exc_info=True)
-            return {"status": "failed", "data": {}}
-
-    def process_balance_report(self, balance_report):
-        """
-        start balance report processing functions
-        """
-        logger.debug("Processing balance report data")
-
-        current_asset_function(self, balance_report)
-        non_current_asset_function(self, balance_report)
-        total_asset_function(self, balance_report)
-        current_debt_function(self, balance_report)
-        non_current_debt_function(self, balance_report)
-        total_debt_function(self, balance_report)
-        ownership_right_total_function(self, balance_report)
-        inventory_function(self, balance_report)
-        net_sale_function(self, balance_report)
-        net_profit_function(self, balance_report)
-        accumulated_profit_function(self, balance_report)
-        trade_payable_function(self, balance_report)
-        advance_function(self, balance_report)
-        reserves_function(self, balance_report)
-        long_term_payable_function(self, balance_report)
-        employee_termination_benefit_reserve_function(self, balance_report)
-
-    def process_profit_loss_statement(self, profit_loss_statement):
-        """
-        start profit loss statement processing functions
-        """
-        logger.debug("Processing profit and loss statement data")
-
-        operational_profit_function(self, profit_loss_statement)
-        gross_profit_function(self, profit_loss_statement)
-        proceed_profit_function(self, profit_loss_statement)
-        salary_fee_function(self, profit_loss_statement)
-        operational_income_expense_function(self, profit_loss_statement)
-        marketing_fee_function(self, profit_loss_statement)
-
-    def process_sold_product_fee(self, sold_product_fee):
-        """
-        start sold product fee processing functions
-        """
-        logger.debug("Processing sold product fee data")
-
-        consuming_material_function(self, sold_product_fee)
-        construction_overhead_function(self, sold_product_fee)
-        production_total_price_function(self, sold_product_fee)
-        sold_product_total_fee_function(self, sold_product_fee)
-        direct_wage_function(self, sold_product_fee)
-
-    def process_ratios(self):
-        logger.debug("Processing financial ratios")
-
-        usability_function(self)
-        efficiency_function(self)
-        roa_function(self)
-        roab_function(self)
-        roe_function(self)
-
-        gross_profit_margin_ratio_function(self)
-        net_profit_margin_ratio_function(self)
-        debt_ratio_function(self)
-        capital_ratio_function(self)
-        total_debt_to_proceed_profit_ratio_function(self)
-        current_debt_to_proceed_profit_ratio_function(self)
-        properitary_ratio_function(self)
-        equity_per_total_debt_ratio_function(self)
-        current_ratio_function(self)
-        instant_ratio_function(self)
-        total_asset_turnover_ratio_function(self)
-        salary_production_fee_function(self)
-        capital_to_asset_ratio_function(self)
-        accumulated_profit_to_asset_ratio_function(self)
-        before_tax_profit_to_asset_ratio_function(self)
-        sale_to_asset_ratio_function(self)
-        equity_per_total_non_current_asset_ratio_function(self)
-        altman_bankruptcy_ratio_function(self)
-        equity_to_debt_ratio_function(self)
-        total_sum_equity_debt_function(self)
-        stock_turn_over_ratio_function(self)
-
-        logger.info("Financial ratio calculations completed")
-
-    def get_results(self):
-        """Return the final processed financial data"""
-
-        logger.info("Generating results for financial calculations")
-
-        return {
-            "status": "success",
-            "data": {
-                "current_asset": self.balance_report_values["current_asset"],
-                "non_current_asset": self.balance_report_values["non_current_asset"],
-                "total_asset": self.balance_report_values["total_asset"],
-                "current_debt": self.balance_report_values["current_debt"],
-                "non_current_debt": self.balance_report_values["non_current_debt"],
-                "total_debt": self.balance_report_values["total_debt"],
-                "total_equity": self.balance_report_values["ownership_right_total"],
-                "net_sale": self.balance_report_values["net_sale"],
-                "inventory": self.balance_report_values["inventory"],
-                "net_profit": self.balance_report_values["net_profit"],
-                "trade_payable": self.balance_report_values["trade_payable"],
-                "advance": self.balance_report_values["advance"],
-                "reserves": self.balance_report_values["reserves"],
-                "long_term_payable": self.balance_report_values["long_term_payable"],
-                "employee_termination_benefit_reserve": self.balance_report_values[
-                    "employee_termination_benefit_reserve"
-                ],
-                "total_sum_equity_debt": self.total_sum_equity_debt,
-                "gross_profit": self.profit_loss_statement_values["gross_profit"],
-                "operational_income_expense": self.profit_loss_statement_values[
-                    "operational_income_expense"
-                ],
-                "marketing_fee": self.profit_loss_statement_values["marketing_fee"],
-                "operational_profit": self.profit_loss_statement_values[
-                    "operational_profit"
-                ],
-                "proceed_profit": self.profit_loss_statement_values["proceed_profit"],
-                "consuming_material": self.sold_product_values["consuming_material"],
-                "production_fee": self.sold_product_values["direct_wage"],
-                "construction_overhead": self.sold_product_values[
-                    "construction_overhead"
-                ],
-                "production_total_price": self.sold_product_values[
-                    "production_total_price"
-                ],
-                "salary_fee": self.profit_loss_statement_values["salary_fee"],
-                "salary_production_fee": self.salary_production_fee,
-                "usability": self.usability,
-                "efficiency": self.efficiency,
-                "roa": self.roa,
-                "roab": self.roab,
-                "roe": self.roe,
-                "gross_profit_margin": self.gross_profit_margin_ratio,
-                "profit_margin_ratio": self.net_profit_margin_ratio,
-                "debt_ratio": self.debt_ratio,
-                "capital_ratio": self.capital_ratio,
-                "proprietary_ratio": self.proprietary_ratio,
-                "equity_per_total_debt_ratio": self.equity_per_total_debt_ratio,
-                "equity_per_total_non_current_asset_ratio": self.equity_per_total_non_current_asset_ratio,
-                "current_ratio": self.current_ratio,
-                "instant_ratio": self.instant_ratio,
-                "stock_turnover": self.stock_turnover,
-                "altman_bankrupsy_ratio": self.altman_bankrupsy_ratio,
-            },
-        }
+class ReadExcel:
+    """
+    Streaming reader of the finance workbook.
 
+    The sheet is read row by row through openpyxl's read-only mode and every
+    record block is parsed once into a float array of shape
+    ``(len(years), length)``: row ``i`` holds the block's values for the
+    ``i``-th date column. Stage durations are kept in ``timings``.
+    """
 
-class ReadExcel:
     def __init__(self, file_path):
         self.file_path: Path = file_path
         self.is_tax: bool = False
-        self.df: pd.DataFrame = None
         self.years: List[int] = list()
         self.months: List[int] = list()
+        self.blocks: Dict[str, np.ndarray] = dict()
+        self.timings: Dict[str, float] = dict()
 
-        self.records: dict = {
+        self.records: dict = self.get_layout()
+
+        self.load_data()
+
+    @staticmethod
+    def get_layout() -> dict:
+        """Offset and length of every record block, counted in non-blank rows."""
+        records = {
             "balance": {"offset": 2, "length": 41},
             "profit_loss": {"offset": None, "length": 32},
             "sold_product": {"offset": None, "length": 13},
             "account_turnover": {"offset": None, "length": 20},
         }
 
-        prev_offset = self.records["balance"]["offset"]
-        for key in list(self.records.keys())[1:]:
-            self.records[key]["offset"] = prev_offset + self.records[key]["length"]
-            prev_offset = self.records[key]["offset"]
-
-        self.load_data()
+        prev_offset = records["balance"]["offset"]
+        for key in list(records.keys())[1:]:
+            records[key]["offset"] = prev_offset + records[key]["length"]
+            prev_offset = records[key]["offset"]
+        return records
 
     def load_data(self):
-        """Lazily loads the DataFrame when first accessed to improve efficiency."""
-        if self.df is None:
-            self.df = pd.read_excel(
-                self.file_path, sheet_name="Sheet1", engine="openpyxl", header=None
-            )
-            self.df = self.df.iloc[1:, 1:].reset_index(drop=True)
-            self.get_dates()
-            if self.df.iloc[1].isnull().all():
-                self.is_tax = True
-                self.df.loc[1] = self.df.loc[1].fillna(-1)
-
-            self.df.dropna(how="all", inplace=True)
-            self.df.reset_index(drop=True, inplace=True)
-
-    def get_dates(self):
-        """Retrieves the dates from the first row of the DataFrame."""
-        self.years.extend(self.df.iloc[0].tolist())
-        self.months.extend(
-            self.df.iloc[1].tolist() if self.df.iloc[1] is not None else []
+        """Parse the dates and every record block in a single pass over the sheet."""
+        started = time.perf_counter()
+        workbook = load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            self.timings["open"] = time.perf_counter() - started
+
+            started = time.perf_counter()
+            rows = self.read_rows(workbook["Sheet1"])
+            self.timings["read"] = time.perf_counter() - started
+        finally:
+            workbook.close()
+
+        started = time.perf_counter()
+        width = max((len(row) for row in rows), default=0)
+        values = np.full((len(rows), width), np.nan)
+        for index, row in enumerate(rows):
+            values[index, : len(row)] = [self.to_number(cell) for cell in row]
+
+        self.get_dates(values)
+        filled = np.array([bool(row) for row in rows], dtype=bool)
+        if len(values) > 1 and np.isnan(values[1]).all():
+            self.is_tax = True
+            values[1] = -1
+            filled[1] = True
+
+        # Blank rows are skipped, the record offsets count the remaining ones
+        values = values[filled]
+        for record_name, record in self.records.items():
+            offset, length = record["offset"], record["length"]
+            self.blocks[record_name] = values[offset : offset + length].T.copy()
+        self.timings["parse"] = time.perf_counter() - started
+
+        logger.info(
+            "Read finance workbook %s: %d columns, %s",
+            self.file_path.name,
+            width,
+            ", ".join(
+                f"{stage} {seconds:.3f}s" for stage, seconds in self.timings.items()
+            ),
         )
 
-    def get_record(self, record_name):
-        """Retrieves a record dynamically by name."""
-        if record_name in self.records:
-            offset = self.records[record_name]["offset"]
-            length = self.records[record_name]["length"]
-            return self.df.iloc[offset : offset + length]
+    @staticmethod
+    def read_rows(sheet) -> List[tuple]:
+        """Cell values of the sheet without its label row and column."""
+        rows = []
+        for row in sheet.iter_rows(min_row=2, min_col=2, values_only=True):
+            # Trailing empty cells are not part of the data
+            last = len(row)
+            while last and row[last - 1] is None:
+                last -= 1
+            rows.append(row[:last])
+
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    @staticmethod
+    def to_number(value) -> float:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+        return np.nan
+
+    def get_dates(self, values):
+        """Retrieves the years and months from the first two rows of the sheet."""
+        if len(values):
+            self.years.extend(
+                int(year) if year == year else year for year in values[0].tolist()
+            )
+        if len(values) > 1:
+            self.months.extend(values[1].tolist())
+
+    def get_period_slices(self) -> List[dict]:
+        """
+        Split the record blocks into one slice per (year, month) date column.
+
+        Each slice is a plain dict with ``year``, ``month`` (``None`` for yearly
+        columns) and the column's values of every record block, empty cells
+        as 0. A repeated date column replaces the earlier one.
+        """
+        slices = {}
+        for index, (year, month) in enumerate(zip(self.years, self.months)):
+            if year != year:  # Trailing column without a date
+                continue
+            month = int(month) if month == month else None
+            slices[(year, month)] = {
+                "year": year,
+                "month": month,
+                "records": {
+                    record_name: np.nan_to_num(block[index], nan=0).tolist()
+                    for record_name, block in self.blocks.items()
+                },
+            }
+        return list(slices.values())
+
+    def get_record(self, record_name) -> np.ndarray:
+        """Retrieves a parsed record block by name, one row per date column."""
+        if record_name in self.blocks:
+            return self.blocks[record_name]
         raise ValueError(f"Record '{record_name}' not found!")
 
     def get_balance_record(self):
@@ -420,3 +197,87 @@ class ReadExcel:
 
     def get_account_turnover_record(self):
         return self.get_record("account_turnover")
+
+
+class FinanceExcelValidator:
+    """
+    Cheap pre-check of an uploaded finance workbook.
+
+    Only the date rows and the label column are read, in read-only mode, and
+    checked against the record layout of ``ReadExcel`` so that malformed files
+    are rejected before any ingestion task is queued.
+    """
+
+    SHEET_NAME = "Sheet1"
+    MONTH_RANGE = range(1, 14)
+
+    def __init__(self, file):
+        self.file = file
+        self.errors: List[str] = list()
+
+    def validate(self) -> List[str]:
+        """Return the layout errors of the workbook, empty when it is valid."""
+        self.errors.clear()
+        try:
+            workbook = load_workbook(self.file, read_only=True, data_only=True)
+        except Exception:
+            return [_("The file is not a readable Excel workbook.")]
+
+        try:
+            if self.SHEET_NAME not in workbook.sheetnames:
+                return [_("The workbook has no sheet named %s.") % self.SHEET_NAME]
+            sheet = workbook[self.SHEET_NAME]
+            self.check_dates(sheet)
+            self.check_rows(sheet)
+        finally:
+            workbook.close()
+            if hasattr(self.file, "seek"):
+                self.file.seek(0)
+        return self.errors
+
+    def check_dates(self, sheet):
+        rows = [
+            list(row)
+            for row in sheet.iter_rows(
+                min_row=2, max_row=3, min_col=2, values_only=True
+            )
+        ]
+        years, months = (rows + [[], []])[:2]
+        while years and years[-1] is None:
+            years.pop()
+
+        if not years:
+            self.errors.append(_("The second row must hold the years."))
+        elif not all(self.is_integer(year) and year > 0 for year in years):
+            self.errors.append(_("Every year in the second row must be a number."))
+
+        months = months[: len(years)]
+        if any(month is not None for month in months) and not all(
+            self.is_integer(month) and month in self.MONTH_RANGE for month in months
+        ):
+            self.errors.append(
+                _("The third row must be empty or hold a month (1-13) for every year.")
+            )
+
+    def check_rows(self, sheet):
+        labels = sum(
+            1
+            for row in sheet.iter_rows(min_row=4, max_col=1, values_only=True)
+            if row and row[0] not in (None, "")
+        )
+        # The layout offsets also count the two date rows
+        required = max(
+            record["offset"] + record["length"]
+            for record in ReadExcel.get_layout().values()
+        )
+        if labels + 2 < required:
+            self.errors.append(
+                _("The sheet has %(found)d labelled rows, %(required)d are expected.")
+                % {"found": labels, "required": required - 2}
+            )
+
+    @staticmethod
+    def is_integer(value) -> bool:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return False
+        return float(value).is_integer()
@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+
+from apps.company.models import CompanyProfile
+from apps.finance import tasks
+from apps.finance.models import FinancialAsset, FinancialData
+
+
+@pytest.fixture
+def make_company(db):
+    def make():
+        return CompanyProfile.objects.create(
+            tech_field=None, special_field=None, province=None, city=None
+        )
+
+    return make
+
+
+@pytest.fixture
+def company(make_company):
+    """A company without any period; the cache starts empty."""
+    cache.clear()
+    return make_company()
+
+
+@pytest.fixture
+def financial_years(db):
+    """
+    ``financial_years(company, periods, **fields)`` creates a FinancialAsset and
+    its FinancialData for each ``year`` or ``(year, month)`` of ``periods``.
+
+    ``net_sale`` defaults to the year. The rows are bulk-created, which skips
+    the lifecycle hooks and receivers that schedule analysis jobs.
+    """
+
+    def create(company, periods, **fields):
+        rows = []
+        for period in periods:
+            year, month = period if isinstance(period, tuple) else (period, None)
+            asset = FinancialAsset.objects.create(
+                company=company, year=year, month=month, is_tax_record=month is None
+            )
+            rows.append(
+                FinancialData(
+                    financial_asset=asset, **{"net_sale": Decimal(year), **fields}
+                )
+            )
+        return FinancialData.objects.bulk_create(rows)
+
+    return create
+
+
+@pytest.fixture
+def enqueued(monkeypatch):
+    """Tasks enqueued by the refresh receivers, instead of sending them to Celery."""
+    calls = []
+    monkeypatch.setattr(
+        tasks.build_chart_payloads,
+        "delay",
+        lambda company_id: calls.append(("charts", company_id)),
+    )
+    monkeypatch.setattr(
+        tasks.generate_company_analysis,
+        "apply_async",
+        lambda args, countdown: calls.append(("analysis", args[0])),
+    )
+    return calls
@@ -0,0 +1,79 @@
+import pytest
+from django.core.cache import cache
+
+from apps.finance.models import AnalysisReport, FinancialData
+from apps.finance.services.analysis import (
+    ANALYSIS_CHARTS,
+    AnalysisService,
+    get_analysis_cache_stats,
+)
+
+
+class FakeClient:
+    def __init__(self, fail=()):
+        self.prompts = []
+        self.fail = fail
+
+    def chat(self, model, messages):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        if any(
+            prompt.startswith(ANALYSIS_CHARTS[name]["prompt"]) for name in self.fail
+        ):
+            raise ConnectionError("upstream unavailable")
+        return {"choices": [{"message": {"content": f"analysis {len(prompt)}"}}]}
+
+
+@pytest.fixture
+def financial_data(company, financial_years):
+    return financial_years(company, (1401, 1402))
+
+
+@pytest.mark.django_db
+class TestAnalysisService:
+    def test_generates_every_chart_on_the_latest_row(
+        self, financial_data, django_assert_max_num_queries
+    ):
+        company_id = financial_data[0].financial_asset.company_id
+        client = FakeClient()
+
+        # FinancialData load, report upsert and the inflation years of the chart cache
+        with django_assert_max_num_queries(3):
+            texts = AnalysisService(company_id, client).generate()
+
+        assert len(client.prompts) == len(ANALYSIS_CHARTS) == len(texts)
+        reports = AnalysisReport.objects.filter(calculated_data=financial_data[-1])
+        assert {report.chart_name: report.text for report in reports} == texts
+        assert {report.period for report in reports} == {AnalysisReport.YEARLY_PERIOD}
+        assert "net_sale: [1401.0, 1402.0]" in client.prompts[0]
+
+    def test_rerun_updates_reports_and_skips_failed_charts(self, financial_data):
+        company_id = financial_data[0].financial_asset.company_id
+        AnalysisService(company_id, FakeClient()).generate()
+        AnalysisReport.objects.filter(chart_name="sale").update(text="stale")
+        cache.clear()
+
+        texts = AnalysisService(company_id, FakeClient(fail=["debt"])).generate()
+
+        assert "debt" not in texts
+        assert AnalysisReport.objects.count() == len(ANALYSIS_CHARTS)
+        assert AnalysisReport.objects.get(chart_name="sale").text == texts["sale"]
+
+    def test_unchanged_series_reuse_cached_texts(self, financial_data):
+        company_id = financial_data[0].financial_asset.company_id
+        texts = AnalysisService(company_id, FakeClient()).generate()
+
+        client = FakeClient()
+        assert AnalysisService(company_id, client).generate() == texts
+        assert client.prompts == []
+        assert get_analysis_cache_stats() == {
+            "hits": len(ANALYSIS_CHARTS),
+            "misses": len(ANALYSIS_CHARTS),
+        }
+
+        FinancialData.objects.filter(id=financial_data[0].id).update(net_sale=1)
+        AnalysisService(company_id, client).generate()
+        # Only the charts that include net_sale are requested again
+        assert len(client.prompts) == sum(
+            "net_sale" in chart for chart in ANALYSIS_CHARTS.values()
+        )
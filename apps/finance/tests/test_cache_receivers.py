@@ -0,0 +1,71 @@
+from decimal import Decimal
+
+import pytest
+
+from apps.core.services.cache_namespace import company_cache
+from apps.finance.models import AnalysisReport, FinancialData
+
+
+@pytest.fixture
+def company(company, financial_years):
+    financial_years(company, (1402,))
+    return company
+
+
+@pytest.mark.django_db
+class TestCompanyCacheReceivers:
+    """The receivers connected in AppConfig.ready, without any test-local connect()."""
+
+    def test_financial_data_save_bumps_the_version(
+        self, company, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        version = company_cache.get_version(company.id)
+        data = FinancialData.objects.get()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            # The lifecycle savepoint pair, the UPDATE and one company_id
+            # lookup; the asset itself is not loaded
+            with django_assert_num_queries(4):
+                data.net_sale = Decimal(2)
+                data.save()
+            # Applied once the transaction commits
+            assert company_cache.get_version(company.id) == version
+
+        assert company_cache.get_version(company.id) != version
+
+    def test_financial_data_delete_bumps_the_version(
+        self, company, django_capture_on_commit_callbacks
+    ):
+        version = company_cache.get_version(company.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            FinancialData.objects.get().delete()
+
+        assert company_cache.get_version(company.id) != version
+
+    def test_loaded_asset_costs_no_lookup(
+        self, company, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        version = company_cache.get_version(company.id)
+        data = FinancialData.objects.select_related("financial_asset").get()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with django_assert_num_queries(3):
+                data.save()
+
+        assert company_cache.get_version(company.id) != version
+
+    def test_analysis_report_save_costs_one_lookup(
+        self, company, django_assert_num_queries, django_capture_on_commit_callbacks
+    ):
+        data_id = FinancialData.objects.get().id
+        version = company_cache.get_version(company.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            # The INSERT and one company_id lookup through the FinancialData
+            with django_assert_num_queries(2):
+                AnalysisReport.objects.create(
+                    calculated_data_id=data_id, chart_name="sale", text="sale"
+                )
+
+        assert company_cache.get_version(company.id) != version
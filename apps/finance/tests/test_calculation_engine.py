@@ -0,0 +1,118 @@
+import json
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from apps.finance.services.engine import FinancialCalculationEngine
+
+# Results of the former row-by-row FinancialCalculations for the assets below;
+# Decimal values are strings, the 0 of a missing statement is an int
+PINNED_RESULTS = json.loads(
+    (Path(__file__).parent / "fixtures" / "calculation_results.json").read_text()
+)
+
+
+class RelatedRows:
+    def __init__(self, row=None):
+        self.row = row
+
+    def first(self):
+        return self.row
+
+
+def make_asset(seed, balance=True, profit_loss=True, sold_product=True):
+    value = Decimal(seed * 1000)
+    balance_report = SimpleNamespace(
+        total_current_asset=value + 300,
+        total_non_current_asset=value * 2,
+        total_current_debt=value / 2,
+        total_non_current_debt=Decimal(seed * 70),
+        ownership_right_total=value - 150,
+        net_sale=value * 3,
+        net_profit=Decimal(seed * 111),
+        accumulated_profit_loss=Decimal(seed * -37),
+        trade_payable=Decimal(seed * 13),
+        advance=Decimal(seed * 7),
+        reserves=Decimal(seed * 5),
+        long_term_payable=Decimal(seed * 17),
+        employee_termination_benefit_reserve=Decimal(seed * 3),
+        first_period_inventory=Decimal(seed * 41),
+        end_period_inventory=Decimal(seed * 43),
+    )
+    profit_loss_statement = SimpleNamespace(
+        operational_profit=Decimal(seed * 91),
+        gross_profit=Decimal(seed * 230),
+        proceed_profit=Decimal(seed * 87) if seed % 2 else Decimal(0),
+        salary_fee=Decimal(seed * 19),
+        operational_income_expense=Decimal(seed * 23),
+        marketing_fee=Decimal(seed * 29),
+    )
+    sold_product_fee = SimpleNamespace(
+        consuming_material=Decimal(seed * 31),
+        construction_overhead=Decimal(seed * 37),
+        production_total_price=Decimal(seed * 53),
+        direct_wage=Decimal(seed * 59),
+        sold_product_total_price=Decimal(seed * 61),
+    )
+    return SimpleNamespace(
+        id=seed,
+        balance_reports=RelatedRows(balance_report if balance else None),
+        profit_loss_statements=RelatedRows(
+            profit_loss_statement if profit_loss else None
+        ),
+        sold_product_fees=RelatedRows(sold_product_fee if sold_product else None),
+    )
+
+
+def loaded_statements(assets):
+    """Statement rows shaped like ``FinancialStatementLoader.load()``."""
+    statements = {}
+    for related_name in FinancialCalculationEngine.STATEMENT_COLUMNS:
+        statements[related_name] = {
+            asset.id: vars(getattr(asset, related_name).first())
+            for asset in assets
+            if getattr(asset, related_name).first()
+        }
+    return statements
+
+
+def pinned(values):
+    return [Decimal(value) if isinstance(value, str) else value for value in values]
+
+
+@pytest.mark.parametrize(
+    "name, assets",
+    [
+        ("complete", [make_asset(seed) for seed in range(1, 8)]),
+        (
+            "missing_statements",
+            [
+                make_asset(1),
+                make_asset(2, balance=False),
+                make_asset(3, profit_loss=False),
+                make_asset(4, sold_product=False),
+                make_asset(5, balance=False, profit_loss=False, sold_product=False),
+            ],
+        ),
+        (
+            "no_balance_reports",
+            [make_asset(seed, balance=False) for seed in range(1, 4)],
+        ),
+    ],
+)
+def test_engine_matches_pinned_results(name, assets):
+    expected = PINNED_RESULTS[name]
+
+    actual = FinancialCalculationEngine(
+        assets, statements=loaded_statements(assets)
+    ).get_results()
+
+    assert actual["status"] == "success"
+    assert list(actual["data"]) == list(expected)
+    for key, values in expected.items():
+        assert actual["data"][key] == pinned(values), key
+        assert [type(v) for v in actual["data"][key]] == [
+            type(v) for v in pinned(values)
+        ], key
@@ -0,0 +1,92 @@
+from unittest import mock
+
+import pytest
+from rest_framework.test import APIRequestFactory
+
+from apps.core.services.cache_namespace import company_cache
+from apps.finance.serializers import BATCH_CHART_NAMES, CHART_SERIALIZER_MAP
+from apps.finance.views.financial import FinancialChartViewSet
+
+URL = "/charts/batch/?yearly=1&names=sale,debt"
+
+
+@pytest.fixture
+def company(company, financial_years):
+    financial_years(company, (1401, 1402), is_published=True)
+    return company
+
+
+@pytest.fixture
+def batch(company):
+    view = FinancialChartViewSet.as_view({"get": "batch"})
+    with (
+        mock.patch.object(FinancialChartViewSet, "get_company", return_value=company),
+        mock.patch.object(FinancialChartViewSet, "permission_classes", []),
+        mock.patch.object(FinancialChartViewSet, "authentication_classes", []),
+    ):
+        yield lambda url=URL, **headers: view(APIRequestFactory().get(url, **headers))
+
+
+def test_batch_returns_requested_charts(batch):
+    response = batch()
+
+    assert response.status_code == 200
+    assert list(response.data["data"]["data"]) == ["sale", "debt"]
+    assert response["ETag"]
+
+
+def test_default_batch_returns_every_chart_once(batch):
+    response = batch("/charts/batch/?yearly=1")
+
+    assert list(response.data["data"]["data"]) == list(BATCH_CHART_NAMES)
+    # Only the legacy spelling is left out
+    assert set(CHART_SERIALIZER_MAP) - set(BATCH_CHART_NAMES) == {"bankrupsy"}
+    assert batch("/charts/batch/?names=bankrupsy").status_code == 200
+
+
+def test_matching_etag_skips_payloads(batch, django_assert_num_queries):
+    etag = batch()["ETag"]
+
+    with django_assert_num_queries(0):
+        response = batch(HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+@pytest.mark.parametrize(
+    "header",
+    ['"other", {etag}', '"other",{etag} , "more"', "W/{etag}", "*"],
+)
+def test_if_none_match_lists(batch, header):
+    etag = batch()["ETag"]
+
+    response = batch(HTTP_IF_NONE_MATCH=header.format(etag=etag))
+
+    assert response.status_code == 304
+
+
+def test_substring_of_etag_does_not_match(batch):
+    etag = batch()["ETag"]
+
+    response = batch(HTTP_IF_NONE_MATCH=etag[:-3] + '"')
+
+    assert response.status_code == 200
+
+
+def test_etag_depends_on_charts_and_period(batch):
+    etag = batch()["ETag"]
+
+    assert batch("/charts/batch/?yearly=1&names=debt,sale")["ETag"] != etag
+    assert batch("/charts/batch/?names=sale,debt")["ETag"] != etag
+
+
+def test_invalidation_changes_etag(batch, company, django_capture_on_commit_callbacks):
+    etag = batch()["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        company_cache.invalidate([company.id])
+    response = batch(HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 200
+    assert response["ETag"] != etag
@@ -0,0 +1,98 @@
+import pytest
+from django.core.cache import cache
+
+from apps.finance.models import AnalysisReport, FinancialData
+from apps.finance.services.charts import (
+    CHART_PERIODS,
+    CHART_TYPES,
+    ChartPayloadService,
+    chart_cache_key,
+    clear_chart_cache,
+)
+from apps.finance.services.finance_service import FinanceService
+
+
+@pytest.fixture
+def company(company, financial_years):
+    financial_years(company, (1401, 1402), is_published=True)
+    return company
+
+
+@pytest.mark.django_db
+class TestChartPayloadService:
+    def test_cached_payload_is_served_without_queries(
+        self, company, django_assert_num_queries
+    ):
+        service = ChartPayloadService(company)
+        payload = service.get_payload("sale", yearly=True)
+
+        with django_assert_num_queries(0):
+            assert service.get_payload("sale", yearly=True) == payload
+        assert [row["net_sale"] for row in payload] == ["1401.00", "1402.00"]
+
+    def test_chart_payload_costs_two_queries(self, company, django_assert_num_queries):
+        for financial_data in FinancialData.objects.all():
+            AnalysisReport.objects.create(
+                calculated_data=financial_data, chart_name="sale", text="sale"
+            )
+            AnalysisReport.objects.create(
+                calculated_data=financial_data, chart_name="debt", text="debt"
+            )
+
+        with django_assert_num_queries(2):
+            payload = ChartPayloadService(company).build_payload("sale", yearly=True)
+
+        assert [[report["text"] for report in row["report"]] for row in payload] == [
+            ["sale"],
+            ["sale"],
+        ]
+
+    def test_batch_payloads_share_one_load(self, company, django_assert_num_queries):
+        service = ChartPayloadService(company)
+        service.get_payload("sale", yearly=True)
+
+        with django_assert_num_queries(2):
+            payloads = service.get_payloads(["sale", "debt", "asset"], yearly=True)
+        with django_assert_num_queries(0):
+            assert service.get_payloads(["sale", "debt", "asset"], yearly=True) == (
+                payloads
+            )
+        assert payloads["sale"] == service.build_payload("sale", yearly=True)
+
+    def test_warm_builds_every_chart_and_period(self, company):
+        ChartPayloadService(company).warm()
+
+        keys = [
+            chart_cache_key(company.id, period, chart)
+            for period in CHART_PERIODS
+            for chart in CHART_TYPES
+        ]
+        payloads = cache.get_many(keys)
+        assert payloads.keys() == set(keys)
+        assert payloads[chart_cache_key(company.id, "monthly", "sale")] == []
+
+    def test_clear_chart_cache_drops_payloads(
+        self, company, django_capture_on_commit_callbacks
+    ):
+        ChartPayloadService(company).warm()
+
+        # Inside a transaction the invalidation waits for the commit
+        with django_capture_on_commit_callbacks(execute=True):
+            clear_chart_cache(company.id)
+            assert cache.get(chart_cache_key(company.id, "yearly", "sale")) is not None
+
+        assert cache.get(chart_cache_key(company.id, "yearly", "sale")) is None
+        assert cache.get(chart_cache_key(company.id, "monthly", "sale")) is None
+
+    def test_publish_drops_payloads(
+        self, company, enqueued, django_capture_on_commit_callbacks
+    ):
+        FinancialData.objects.update(is_published=False)
+        ChartPayloadService(company).warm()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            FinanceService.publish_financial_data(FinancialData.objects.all())
+
+        assert cache.get(chart_cache_key(company.id, "yearly", "sale")) is None
+        payload = ChartPayloadService(company).get_payload("sale", yearly=True)
+        assert [row["net_sale"] for row in payload] == ["1401.00", "1402.00"]
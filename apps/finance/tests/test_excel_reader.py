@@ -0,0 +1,197 @@
+import numpy as np
+import pytest
+from openpyxl import Workbook
+
+from apps.finance import tasks
+from apps.finance.models import (
+    BalanceReport,
+    FinanceExcelFile,
+    FinancialAsset,
+    SoldProductFee,
+)
+from apps.finance.services.utils import FinanceExcelValidator, ReadExcel
+from apps.finance.tasks import generate_financial_asset, ingest_financial_periods
+
+
+def write_workbook(path, months=None, rows=90):
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Sheet1"
+    sheet.append(["label"])
+    sheet.append(["years", 1401, 1402, 1403])
+    sheet.append(["months", *(months or [])])
+    for index in range(rows):
+        sheet.append([f"item {index}", index, index + 100, index + 200])
+        if index == 5:
+            sheet.append([])
+    workbook.save(path)
+    return path
+
+
+def run_chord(header):
+    """Run a chord in-process: the header tasks first, then the callback."""
+    results = [signature.apply().get() for signature in header]
+    return lambda callback: callback.apply(args=(results,)).get()
+
+
+def test_reads_dates_and_blocks_per_column(tmp_path):
+    reader = ReadExcel(write_workbook(tmp_path / "finance.xlsx"))
+
+    assert reader.years == [1401, 1402, 1403]
+    assert reader.is_tax is True
+    assert all(month != month for month in reader.months)
+    assert set(reader.timings) == {"open", "read", "parse"}
+
+    balance = reader.get_balance_record()
+    assert balance.shape == (3, 41)
+    # The blank row is skipped, so the block is contiguous
+    np.testing.assert_array_equal(balance[0], np.arange(41))
+    np.testing.assert_array_equal(balance[2], np.arange(200, 241))
+
+    profit_loss = reader.get_profit_loss_record()
+    assert profit_loss.shape == (3, 32)
+    assert profit_loss[1, 0] == 132
+
+
+def test_monthly_workbook_is_not_tax(tmp_path):
+    reader = ReadExcel(write_workbook(tmp_path / "finance.xlsx", months=[1, 2, 3]))
+
+    assert reader.is_tax is False
+    assert reader.months == [1.0, 2.0, 3.0]
+    assert reader.get_account_turnover_record().shape == (3, 20)
+
+
+def test_unknown_record(tmp_path):
+    reader = ReadExcel(write_workbook(tmp_path / "finance.xlsx", rows=3))
+
+    with pytest.raises(ValueError):
+        reader.get_record("cash_flow")
+
+
+def test_period_slices_follow_the_date_columns(tmp_path):
+    reader = ReadExcel(write_workbook(tmp_path / "finance.xlsx", months=[1, 2, 3]))
+
+    slices = reader.get_period_slices()
+
+    assert [(item["year"], item["month"]) for item in slices] == [
+        (1401, 1),
+        (1402, 2),
+        (1403, 3),
+    ]
+    assert slices[1]["records"]["balance"][:3] == [100.0, 101.0, 102.0]
+    assert len(slices[2]["records"]["sold_product"]) == 13
+
+
+@pytest.mark.django_db
+def test_generate_financial_asset_writes_each_year_once(company, tmp_path, monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(
+        "apps.finance.tasks.schedule_financial_recalculation", scheduled.append
+    )
+    monkeypatch.setattr("apps.finance.tasks.chord", run_chord)
+    path = write_workbook(tmp_path / "finance.xlsx")
+
+    generate_financial_asset(company.id, str(path))
+    generate_financial_asset(company.id, str(path))
+
+    assets = FinancialAsset.objects.filter(company=company, month=None)
+    assert sorted(assets.values_list("year", flat=True)) == [1401, 1402, 1403]
+    assert SoldProductFee.objects.filter(financial_asset__in=assets).count() == 3
+    # Every year gets its own column of the workbook
+    balances = BalanceReport.objects.filter(financial_asset__in=assets)
+    assert {
+        balance.financial_asset.year: balance.advance_payment for balance in balances
+    } == {1401: 0, 1402: 100, 1403: 200}
+    # One recompute per file, not per period
+    assert scheduled == [company.id, company.id]
+
+
+@pytest.mark.django_db
+def test_sent_file_queues_the_ingestion(
+    company, monkeypatch, django_capture_on_commit_callbacks
+):
+    queued = []
+    monkeypatch.setattr(
+        tasks.generate_financial_asset,
+        "delay",
+        lambda company_id, path: queued.append((company_id, path)),
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        FinanceExcelFile.objects.create(company=company, file="excel/draft.xlsx")
+    assert queued == []
+
+    with django_capture_on_commit_callbacks(execute=True):
+        excel_file = FinanceExcelFile.objects.create(
+            company=company, file="excel/finance.xlsx", is_sent=True
+        )
+
+    assert queued == [(company.id, excel_file.file.path)]
+
+
+@pytest.mark.django_db
+def test_workbook_is_split_into_batches_of_periods(
+    company, tmp_path, monkeypatch, settings
+):
+    settings.FINANCE_INGESTION_PERIODS_PER_TASK = 2
+    batches = []
+
+    def record_chord(header):
+        header = list(header)
+        batches.extend(
+            [(item["year"], item["month"]) for item in signature.args[2]]
+            for signature in header
+        )
+        return run_chord(header)
+
+    monkeypatch.setattr("apps.finance.tasks.schedule_financial_recalculation", id)
+    monkeypatch.setattr("apps.finance.tasks.chord", record_chord)
+
+    generate_financial_asset(company.id, str(write_workbook(tmp_path / "f.xlsx")))
+
+    assert batches == [[(1401, None), (1402, None)], [(1403, None)]]
+    assert BalanceReport.objects.filter(financial_asset__company=company).count() == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("periods", [1, 3])
+def test_batch_ingestion_costs_a_fixed_number_of_queries(
+    company, tmp_path, django_assert_num_queries, periods
+):
+    reader = ReadExcel(write_workbook(tmp_path / "finance.xlsx"))
+    period_slices = reader.get_period_slices()[:periods]
+
+    # Asset lookup and insert, then one read and one write per statement table
+    # inside their savepoints, however many periods the batch holds
+    with django_assert_num_queries(20):
+        assert ingest_financial_periods(company.id, True, period_slices) == 4 * periods
+
+
+class TestFinanceExcelValidator:
+    def test_valid_workbook(self, tmp_path):
+        path = write_workbook(tmp_path / "finance.xlsx", months=[1, 2, 3])
+
+        with open(path, "rb") as file:
+            assert FinanceExcelValidator(file).validate() == []
+            # The upload is rewound for the storage backend
+            assert file.tell() == 0
+
+    def test_short_sheet_is_rejected(self, tmp_path):
+        path = write_workbook(tmp_path / "finance.xlsx", rows=40)
+
+        errors = FinanceExcelValidator(path).validate()
+
+        assert errors == ["The sheet has 40 labelled rows, 85 are expected."]
+
+    def test_bad_dates_are_rejected(self, tmp_path):
+        path = write_workbook(tmp_path / "finance.xlsx", months=[1, "Farvardin", 3])
+
+        assert len(FinanceExcelValidator(path).validate()) == 1
+
+    def test_unreadable_file_is_rejected(self, tmp_path):
+        path = tmp_path / "finance.xlsx"
+        path.write_bytes(b"not a workbook")
+
+        assert FinanceExcelValidator(path).validate() == [
+            "The file is not a readable Excel workbook."
+        ]
@@ -0,0 +1,60 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+
+from apps.core.services.cache_namespace import company_cache
+from apps.finance.models import FinancialData
+from apps.finance.services.series import (
+    FINANCIAL_SERIES_FIELDS,
+    get_financial_series,
+)
+
+
+@pytest.fixture
+def financial_data(company, financial_years):
+    return financial_years(
+        company, (1402, (1401, 6), 1401), inventory_average=Decimal("2.5")
+    )
+
+
+@pytest.mark.django_db
+class TestFinancialSeries:
+    @pytest.mark.usefixtures("financial_data")
+    def test_columns_are_built_from_one_query(self, company, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            series = get_financial_series(company.id)
+
+        assert series.keys() == {"year", "month", *FINANCIAL_SERIES_FIELDS}
+        assert series["year"] == [1401.0, 1401.0, 1402.0]
+        assert sorted(series["month"], key=str) == ["", "", 6.0]
+        assert series["net_sale"] == [1401.0, 1401.0, 1402.0]
+        assert series["inventory"] == [2.5, 2.5, 2.5]
+
+    @pytest.mark.usefixtures("financial_data")
+    def test_cached_series_is_served_without_queries(
+        self, company, django_assert_num_queries
+    ):
+        series = get_financial_series(company.id)
+
+        with django_assert_num_queries(0):
+            assert get_financial_series(company.id) == series
+
+        FinancialData.objects.update(net_sale=1)
+        company_cache.apply({company.id}, set())
+        assert get_financial_series(company.id)["net_sale"] == [1.0, 1.0, 1.0]
+
+    @pytest.mark.usefixtures("financial_data")
+    def test_series_expire_after_the_setting(self, company, settings):
+        settings.FINANCE_SERIES_CACHE_TIMEOUT = 60
+
+        with mock.patch("apps.finance.services.series.cache") as series_cache:
+            series_cache.get.return_value = None
+            series = get_financial_series(company.id)
+
+        series_cache.set.assert_called_once_with(mock.ANY, series, 60)
+
+    def test_company_without_data(self, company):
+        series = get_financial_series(company.id)
+
+        assert series["year"] == series["net_sale"] == []
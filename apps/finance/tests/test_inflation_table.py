@@ -0,0 +1,78 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+from apps.finance.models import Inflation
+from apps.finance.services.finance_service import MONETARY_FIELDS, FinanceService
+from apps.finance.services.functions import (
+    current_value_amount_with_cpi,
+    current_value_amount_with_inflation_ratio,
+)
+from apps.finance.services.inflation import InflationTable
+
+
+@pytest.fixture
+def inflation_table(db):
+    Inflation.objects.create(year=1400, cpi_value=Decimal("100"), inflation_rate=40)
+    Inflation.objects.create(year=1401, cpi_value=Decimal("150"), inflation_rate=50)
+    Inflation.objects.create(year=1402, cpi_value=Decimal("300"), inflation_rate=30)
+    InflationTable.invalidate()
+    return InflationTable
+
+
+@pytest.mark.django_db
+class TestInflationTable:
+    def test_scalar_conversions_keep_decimal_results(self, inflation_table):
+        value = current_value_amount_with_cpi(1400, 1402, Decimal(10))
+        assert value == Decimal(30)
+        assert isinstance(value, Decimal)
+
+        value = current_value_amount_with_inflation_ratio(1401, Decimal(10))
+        assert value == Decimal(15)
+        assert isinstance(value, Decimal)
+
+    def test_series_conversion_runs_one_query(
+        self, inflation_table, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            values = inflation_table.convert_with_cpi(
+                [Decimal(10), Decimal(20), Decimal(30)], [1400, 1401, 1402], 1402
+            )
+            inflation_table.convert_with_inflation_ratio([Decimal(10)] * 3, 1400)
+        assert values.tolist() == [Decimal(30), Decimal(40), Decimal(30)]
+
+    def test_invalidate_reloads_changed_rows(self, inflation_table):
+        assert inflation_table.convert_with_cpi(Decimal(1), 1400, 1401) == Decimal(
+            "1.5"
+        )
+
+        Inflation.objects.filter(year=1401).update(cpi_value=Decimal("200"))
+        InflationTable.invalidate()
+
+        assert inflation_table.convert_with_cpi(Decimal(1), 1400, 1401) == Decimal(2)
+
+    def test_missing_year_raises_value_error(self, inflation_table):
+        with pytest.raises(ValueError):
+            inflation_table.convert_with_cpi([Decimal(1)], [1399], 1402)
+
+
+@pytest.mark.django_db
+def test_deflate_financial_data_converts_monetary_fields_only(inflation_table):
+    financial_data = [
+        SimpleNamespace(
+            financial_asset=SimpleNamespace(year=year),
+            roa=Decimal("0.5"),
+            **{field: Decimal(300) for field in MONETARY_FIELDS},
+        )
+        for year in (1400, 1402)
+    ]
+
+    FinanceService.deflate_financial_data(financial_data, 1402)
+
+    assert [item.net_sale for item in financial_data] == [Decimal(900), Decimal(300)]
+    assert [item.total_asset for item in financial_data] == [
+        Decimal(900),
+        Decimal(300),
+    ]
+    assert [item.roa for item in financial_data] == [Decimal("0.5"), Decimal("0.5")]
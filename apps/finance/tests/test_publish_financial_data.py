@@ -0,0 +1,64 @@
+import pytest
+
+from apps.core.services.cache_namespace import company_cache
+from apps.finance.models import FinancialData
+from apps.finance.services.finance_service import FinanceService
+
+
+@pytest.fixture
+def financial_data(company, make_company, financial_years):
+    return [
+        *financial_years(company, (1401, 1402, 1403)),
+        *financial_years(make_company(), (1401, 1402, 1403)),
+    ]
+
+
+def versions(financial_data):
+    return {
+        item.financial_asset.company_id: company_cache.get_version(
+            item.financial_asset.company_id
+        )
+        for item in financial_data
+    }
+
+
+@pytest.mark.django_db
+def test_publish_refreshes_each_company_once(
+    financial_data,
+    enqueued,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    FinancialData.objects.filter(id=financial_data[0].id).update(is_published=True)
+    before = versions(financial_data)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        # One read of the rows to publish and one UPDATE
+        with django_assert_num_queries(2):
+            published = FinanceService.publish_financial_data(
+                FinancialData.objects.all()
+            )
+        assert enqueued == []
+
+    assert published == 5
+    assert not FinancialData.objects.filter(is_published=False).exists()
+    after = versions(financial_data)
+    assert all(after[company_id] != before[company_id] for company_id in before)
+    # The connected receiver rebuilds the charts and schedules one analysis each
+    assert sorted(enqueued) == sorted(
+        (task, company_id) for company_id in before for task in ("analysis", "charts")
+    )
+
+
+@pytest.mark.django_db
+def test_publishing_published_rows_is_a_no_op(
+    financial_data, enqueued, django_capture_on_commit_callbacks
+):
+    FinancialData.objects.update(is_published=True)
+    before = versions(financial_data)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert FinanceService.publish_financial_data(FinancialData.objects.all()) == 0
+
+    assert versions(financial_data) == before
+    assert enqueued == []
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from django.core.cache import cache
+
+from apps.finance import tasks
+from apps.finance.models import FinancialAsset
+from apps.finance.services.finance_service import FinanceService
+
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    """Countdowns of the recalculation tasks enqueued, instead of sending them."""
+    countdowns = []
+    monkeypatch.setattr(
+        tasks.recalculate_company_financials,
+        "apply_async",
+        lambda args, countdown: countdowns.append(countdown),
+    )
+    return countdowns
+
+
+@pytest.fixture
+def refreshed(monkeypatch):
+    """``asset_ids`` of every refresh_financial_data call."""
+    calls = []
+    monkeypatch.setattr(
+        FinanceService,
+        "refresh_financial_data",
+        lambda self, asset_ids=None: calls.append(asset_ids),
+    )
+    return calls
+
+
+@pytest.mark.django_db
+class TestScheduleFinancialRecalculation:
+    def test_asset_saves_are_coalesced_into_one_task(
+        self, company, scheduled, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            first = FinancialAsset.objects.create(
+                company=company, year=1401, is_tax_record=True
+            )
+            second = FinancialAsset.objects.create(
+                company=company, year=1402, is_tax_record=True
+            )
+            first.save()
+
+        assert len(scheduled) == 1
+        assert tasks._pop_changed_assets(company.id) == {first.id, second.id}
+
+    def test_changes_are_consumed_once(self, company, scheduled):
+        tasks.schedule_financial_recalculation(company.id, 1)
+        tasks.schedule_financial_recalculation(company.id, 2)
+        assert tasks._pop_changed_assets(company.id) == {1, 2}
+
+        # Nothing changed since the last run: refresh everything to be safe
+        assert tasks._pop_changed_assets(company.id) is None
+
+        tasks.schedule_financial_recalculation(company.id, 3)
+        assert tasks._pop_changed_assets(company.id) == {3}
+
+    def test_full_refresh_request_or_lost_entries_refresh_everything(
+        self, company, scheduled
+    ):
+        tasks.schedule_financial_recalculation(company.id, 1)
+        tasks.schedule_financial_recalculation(company.id)
+        assert tasks._pop_changed_assets(company.id) is None
+
+        tasks.schedule_financial_recalculation(company.id, 1)
+        tasks.schedule_financial_recalculation(company.id, 2)
+        _, _, sequence_key, _ = tasks._recalculation_keys(company.id)
+        cache.delete(tasks._changed_asset_key(company.id, cache.get(sequence_key)))
+        assert tasks._pop_changed_assets(company.id) is None
+
+
+@pytest.mark.django_db
+class TestRecalculateCompanyFinancials:
+    def test_task_is_postponed_until_changes_stop(
+        self, company, scheduled, refreshed, settings
+    ):
+        tasks.schedule_financial_recalculation(company.id, 1)
+
+        tasks.recalculate_company_financials(company.id)
+
+        debounce = settings.FINANCE_RECALCULATION_DEBOUNCE.total_seconds()
+        assert refreshed == []
+        assert len(scheduled) == 2
+        assert 0 < scheduled[-1] <= debounce
+
+    def test_quiet_company_is_refreshed_and_can_be_scheduled_again(
+        self, company, scheduled, refreshed, settings
+    ):
+        tasks.schedule_financial_recalculation(company.id, 1)
+        tasks.schedule_financial_recalculation(company.id, 2)
+        _, last_change_key, _, _ = tasks._recalculation_keys(company.id)
+        debounce = settings.FINANCE_RECALCULATION_DEBOUNCE.total_seconds()
+        cache.set(last_change_key, time.time() - debounce - 1)
+
+        tasks.recalculate_company_financials(company.id)
+
+        assert refreshed == [{1, 2}]
+        assert len(scheduled) == 1
+        tasks.schedule_financial_recalculation(company.id, 3)
+        assert len(scheduled) == 2
@@ -0,0 +1,148 @@
+from unittest import mock
+
+import pytest
+
+from apps.core.services.cache_namespace import company_cache
+from apps.finance.models import (
+    BalanceReport,
+    FinancialAsset,
+    FinancialData,
+    ProfitLossStatement,
+    SoldProductFee,
+)
+from apps.finance.services.finance_service import FinanceService
+from apps.finance.services.series import get_financial_series
+
+
+@pytest.fixture
+def company(company):
+    for idx, year in enumerate((1400, 1401, 1402, 1403)):
+        asset = FinancialAsset.objects.create(
+            company=company, year=year, is_tax_record=True
+        )
+        BalanceReport.objects.create(
+            financial_asset=asset,
+            total_current_asset=100 * year,
+            total_non_current_asset=50 + idx,
+            net_sale=7 * year,
+            net_profit=3 * idx,
+            ownership_right_total=9 + idx,
+            first_period_inventory=11 * idx + 1,
+            end_period_inventory=17 * idx,
+        )
+        ProfitLossStatement.objects.create(
+            financial_asset=asset, gross_profit=5 * idx, proceed_profit=idx
+        )
+        SoldProductFee.objects.create(
+            financial_asset=asset, sold_product_total_price=4 * year + idx
+        )
+    return company
+
+
+@pytest.mark.django_db
+class TestRefreshReceivers:
+    def test_refresh_rebuilds_charts_after_commit(
+        self, company, enqueued, django_capture_on_commit_callbacks
+    ):
+        version = company_cache.get_version(company.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            FinanceService(company).refresh_financial_data()
+            assert enqueued == []
+
+        assert FinancialData.objects.count() == 4
+        assert company_cache.get_version(company.id) != version
+        # Recalculated rows are unpublished until an admin publishes them
+        assert enqueued == [("charts", company.id)]
+
+    def test_refresh_drops_cached_series(
+        self, company, enqueued, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            FinanceService(company).refresh_financial_data()
+        series = get_financial_series(company.id)
+
+        BalanceReport.objects.update(net_sale=1)
+        with django_capture_on_commit_callbacks(execute=True):
+            FinanceService(company).refresh_financial_data()
+
+        assert get_financial_series(company.id)["net_sale"] != series["net_sale"]
+        assert get_financial_series(company.id)["net_sale"] == [1.0] * 4
+
+    def test_publish_schedules_the_analysis(
+        self, company, enqueued, django_capture_on_commit_callbacks
+    ):
+        FinanceService(company).refresh_financial_data()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            FinanceService.publish_financial_data(FinancialData.objects.all())
+
+        assert enqueued == [("charts", company.id), ("analysis", company.id)]
+
+
+def snapshot():
+    fields = [
+        field.name
+        for field in FinancialData._meta.fields
+        if field.name not in ("id", "created_at", "updated_at")
+    ]
+    return {
+        row["financial_asset"]: row for row in FinancialData.objects.values(*fields)
+    }
+
+
+@pytest.mark.django_db
+class TestIncrementalRefresh:
+    def test_changed_period_matches_a_full_refresh(self, company):
+        service = FinanceService(company)
+        service.refresh_financial_data()
+        assets = list(FinancialAsset.objects.order_by("year"))
+        before = snapshot()
+
+        BalanceReport.objects.filter(financial_asset=assets[2]).update(
+            net_sale=12345, end_period_inventory=999
+        )
+        with mock.patch.object(
+            FinanceService,
+            "patch_stock_turnover",
+            autospec=True,
+            side_effect=FinanceService.patch_stock_turnover,
+        ) as patch_stock_turnover:
+            recalculated = service.refresh_financial_data({assets[2].id})
+        incremental = snapshot()
+
+        assert [item.financial_asset_id for item in recalculated] == [assets[2].id]
+        patch_stock_turnover.assert_called_once()
+        changed = incremental[assets[2].id]
+        assert changed["net_sale"] != before[assets[2].id]["net_sale"]
+        # The inventory mean moved, so the untouched periods were patched
+        neighbour = incremental[assets[0].id]
+        assert neighbour["stock_turnover"] != before[assets[0].id]["stock_turnover"]
+        assert neighbour["net_sale"] == before[assets[0].id]["net_sale"]
+
+        service.refresh_financial_data()
+        assert incremental == snapshot()
+
+    def test_deleted_period_matches_a_full_refresh(self, company):
+        service = FinanceService(company)
+        service.refresh_financial_data()
+        asset = FinancialAsset.objects.order_by("year").last()
+
+        asset.delete()
+        service.refresh_financial_data({asset.id})
+        incremental = snapshot()
+
+        assert asset.id not in incremental
+        service.refresh_financial_data()
+        assert incremental == snapshot()
+
+    def test_missing_stored_rows_fall_back_to_a_full_refresh(self, company):
+        service = FinanceService(company)
+        service.refresh_financial_data()
+        first, second, *_ = FinancialAsset.objects.order_by("year")
+        FinancialData.objects.filter(financial_asset=first).delete()
+
+        refreshed = service.refresh_financial_data({second.id})
+
+        assert len(refreshed) == 4
+        assert FinancialData.objects.filter(financial_asset=first).exists()
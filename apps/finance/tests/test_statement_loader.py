@@ -0,0 +1,59 @@
+import pytest
+
+from apps.finance.models import (
+    BalanceReport,
+    FinancialAsset,
+    ProfitLossStatement,
+    SoldProductFee,
+)
+from apps.finance.services.loader import FinancialStatementLoader
+
+
+@pytest.fixture
+def assets(company):
+    assets = []
+    for year in (1401, 1402, 1403):
+        asset = FinancialAsset.objects.create(
+            company=company, year=year, is_tax_record=True
+        )
+        BalanceReport.objects.create(financial_asset=asset, net_sale=year)
+        ProfitLossStatement.objects.create(financial_asset=asset, gross_profit=year)
+        assets.append(asset)
+    # A second statement of the same asset is ignored, like .first() does
+    BalanceReport.objects.create(financial_asset=assets[0], net_sale=1)
+    SoldProductFee.objects.create(financial_asset=assets[1], sold_product_total_price=7)
+    return assets
+
+
+@pytest.mark.django_db
+class TestFinancialStatementLoader:
+    def test_one_query_per_statement_table(self, assets, django_assert_num_queries):
+        loader = FinancialStatementLoader(asset.id for asset in assets)
+
+        with django_assert_num_queries(4):
+            loaded = loader.load()
+
+        assert loaded.keys() == FinancialStatementLoader.STATEMENT_MODELS.keys()
+        balance_reports = loaded["balance_reports"]
+        assert {
+            asset_id: row["net_sale"] for asset_id, row in balance_reports.items()
+        } == {asset.id: asset.year for asset in assets}
+        assert balance_reports[assets[0].id]["net_sale"] == (
+            assets[0].balance_reports.first().net_sale
+        )
+        assert list(loaded["sold_product_fees"]) == [assets[1].id]
+        assert loaded["account_turnovers"] == {}
+
+    def test_only_the_requested_fields_are_read(
+        self, assets, django_assert_num_queries
+    ):
+        loader = FinancialStatementLoader(
+            [assets[0].id], {"profit_loss_statements": ["gross_profit"]}
+        )
+
+        with django_assert_num_queries(1):
+            loaded = loader.load()
+
+        assert loaded == {
+            "profit_loss_statements": {assets[0].id: {"gross_profit": 1401}}
+        }
@@ -1,14 +1,18 @@
+import hashlib
 import logging
 import os
 
+from django.core.cache import cache
 from django.db.models.signals import post_save
 from django.http import FileResponse
+from django.utils.http import parse_etags
 from django.views.decorators.clickjacking import xframe_options_exempt
 from rest_framework import status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet, ViewSet
 
+from apps.core.services.cache_namespace import company_cache
 from apps.finance.models import (
     BalanceReportFile,
     TaxDeclarationFile,
@@ -21,6 +25,8 @@ from apps.finance.serializers import (
     BalanceReportRetrieveSerializer,
     BalanceReportSerializer,
     BankrupsyChartSerializer,
+    BATCH_CHART_NAMES,
+    CHART_SERIALIZER_MAP,
     CostChartSerializer,
     DebtChartSerializer,
     EquityChartSerializer,
@@ -36,12 +42,15 @@ from apps.finance.serializers import (
     TaxDeclarationRetrieveSerializer,
     TaxDeclarationSerializer,
 )
+from apps.finance.services.charts import ChartPayloadService, real_chart_cache_key
 from apps.finance.services.finance_service import FinanceService
+from apps.finance.services.inflation import InflationTable
 from apps.finance.views.mixin import ViewSetMixin
 from apps.finance.views.paginations import BasePagination
 from constants.errors import (
     FinancialChartNameError,
     FinancialDataNotFoundError,
+    InflationBaseYearError,
     NoQueryParameterError,
 )
 from constants.responses import APIResponse
@@ -236,22 +245,7 @@ class FinancialDataViewSet(ViewSetMixin, ReadOnlyModelViewSet):
 class FinancialChartViewSet(ViewSetMixin, ReadOnlyModelViewSet):
     lookup_field = "slug"
 
-    CHART_SERIALIZER_MAP = {
-        "debt": DebtChartSerializer,
-        "asset": AssetChartSerializer,
-        "sale": SaleChartSerializer,
-        "equity": EquityChartSerializer,
-        "bankruptcy": BankrupsyChartSerializer,
-        "bankrupsy": BankrupsyChartSerializer,
-        "profitability": ProfitibilityChartSerializer,
-        "inventory": InventoryChartSerializer,
-        "agility": AgilityChartSerializer,
-        "liquidity": LiquidityChartSerializer,
-        "leverage": LeverageChartSerializer,
-        "cost": CostChartSerializer,
-        "profit": ProfitChartSerializer,
-        "salary": SalaryChartSerializer, 
-    }
+    CHART_SERIALIZER_MAP = CHART_SERIALIZER_MAP
     serializer_class = FinancialDataSerializer
 
     def get_serializer_class(self):
@@ -266,16 +260,75 @@ class FinancialChartViewSet(ViewSetMixin, ReadOnlyModelViewSet):
     def get_queryset(self):
         company = self.get_company()
         yearly = self.request.query_params.get("yearly")
-        qs = _repo.get_financial_charts_for_company(company, bool(yearly))
+        chart_name = getattr(self.get_serializer_class(), "chart_name", None)
+        qs = _repo.get_financial_charts_for_company(company, bool(yearly), chart_name)
         return qs
 
+    @action(detail=False, methods=["get"], url_path="batch")
+    def batch(self, request):
+        """
+        Several charts in one response, e.g. ``?names=debt,asset&yearly=1``.
+        Without ``names`` every chart is returned. Supports ``If-None-Match``.
+        """
+        names = request.query_params.get("names")
+        charts = (
+            list(dict.fromkeys(name.strip() for name in names.split(",") if name.strip()))
+            if names
+            else list(BATCH_CHART_NAMES)
+        )
+        if not charts or any(chart not in self.CHART_SERIALIZER_MAP for chart in charts):
+            raise FinancialChartNameError
+
+        yearly = bool(request.query_params.get("yearly"))
+        company = self.get_company()
+        # The payloads only change when the company namespace is bumped, so the
+        # tag is known before anything is loaded.
+        version = company_cache.get_version(company.id)
+        period = "yearly" if yearly else "monthly"
+        etag = '"%s"' % hashlib.md5(
+            f"{company.id}:{version}:{period}:{','.join(charts)}".encode()
+        ).hexdigest()
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if "*" in if_none_match or etag in (tag.removeprefix("W/") for tag in if_none_match):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        data = ChartPayloadService(company).get_payloads(charts, yearly, version)
+
+        response = APIResponse.success(
+            data={
+                "code": 200,
+                "message": "success",
+                "data": data
+            }
+        )
+        response["ETag"] = etag
+        return response
+
+    def get_real_base_year(self):
+        real = self.request.query_params.get("real")
+        if not real:
+            return None
+        try:
+            return int(real)
+        except ValueError:
+            raise InflationBaseYearError
+
     def retrieve(self, request, *args, **kwargs):
         slug = kwargs.get(self.lookup_field)  # 'slug'
-        queryset = self.get_queryset()
-        serializer_class = self.get_serializer_class()
-        serializer = serializer_class(queryset, many=True, context=self.get_serializer_context())
-
-        if not queryset.exists():
+        base_year = self.get_real_base_year()
+        if base_year is not None:
+            return self.retrieve_real(slug, base_year)
+
+        if slug in self.CHART_SERIALIZER_MAP:
+            yearly = bool(self.request.query_params.get("yearly"))
+            data = ChartPayloadService(self.get_company()).get_payload(slug, yearly)
+        else:
+            serializer_class = self.get_serializer_class()
+            data = serializer_class(
+                self.get_queryset(), many=True, context=self.get_serializer_context()
+            ).data
+
+        if not data:
             return APIResponse.success(
                 data={
                     "code": 404,
@@ -288,10 +341,51 @@ class FinancialChartViewSet(ViewSetMixin, ReadOnlyModelViewSet):
             data={
                 "code": 200,
                 "message": "success",
-                "data": serializer.data
+                "data": data
             }
         )
-        
+
+    def retrieve_real(self, slug, base_year):
+        """
+        Chart series with every monetary field deflated to ``base_year`` money,
+        cached per company, period, chart, base year and inflation table version.
+        """
+        company = self.get_company()
+        period = "yearly" if self.request.query_params.get("yearly") else "monthly"
+        cache_key = real_chart_cache_key(
+            company.id, period, slug, base_year, InflationTable.get_version()
+        )
+        data = cache.get(cache_key)
+
+        if data is None:
+            financial_data = list(self.get_queryset())
+            if not financial_data:
+                return APIResponse.success(
+                    data={
+                        "code": 404,
+                        "message": f"No data found for chart '{slug}'",
+                        "data": []
+                    }
+                )
+            try:
+                FinanceService.deflate_financial_data(financial_data, base_year)
+            except ValueError:
+                raise InflationBaseYearError
+            serializer_class = self.get_serializer_class()
+            data = serializer_class(
+                financial_data, many=True, context=self.get_serializer_context()
+            ).data
+            cache.set(cache_key, data)
+
+        return APIResponse.success(
+            data={
+                "code": 200,
+                "message": "success",
+                "base_year": base_year,
+                "data": data
+            }
+        )
+
 
 class FinanceAnalysisSummaryViewSet(ViewSetMixin, ViewSet):
     CHART_SERIALIZER_MAP = {
@@ -1,14 +1,21 @@
 import logging
 
 from celery import shared_task
-from django.conf import settings
-from google import genai
 from openai import OpenAIError
 from pydantic import BaseModel, ValidationError
 
+from apps.core.services.llm_gateway import get_llm_gateway
+
 logger = logging.getLogger("swot")
 
 
+class SWOTResponse(BaseModel):
+    so: str
+    st: str
+    wo: str
+    wt: str
+
+
 @shared_task(bind=True, rate_limit="5/m")
 def generate_swot_analysis(self, instance_pk: int) -> None:
     from apps.swot.models import (  # noqa: F401
@@ -16,12 +23,6 @@ def generate_swot_analysis(self, instance_pk: int) -> None:
         SWOTMatrix,
     )
 
-    class SWOTResponse(BaseModel):
-        so: str
-        st: str
-        wo: str
-        wt: str
-
     try:
         instance = SWOTMatrix.objects.select_related("company").get(pk=instance_pk)
 
@@ -120,16 +121,20 @@ def generate_swot_analysis(self, instance_pk: int) -> None:
             - ⚠️ **تمام خروجی‌ها باید به زبان فارسی و در قالب Markdown باشند**
             - ⚠️ **هر بخش را با سرفصل مناسب و سازمان‌یافته ارائه دهید**
             """
-        client = genai.Client(api_key=settings.FARABIN_GEMINI_API_KEY)
-        response = client.models.generate_content(
+        response = get_llm_gateway().chat(
             model="gemini-2.0-flash",
-            contents=prompt,
-            config={
-                "response_mime_type": "application/json",
-                "response_schema": SWOTResponse,
+            messages=[{"role": "user", "content": prompt}],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "swot_response",
+                    "schema": SWOTResponse.model_json_schema(),
+                },
             },
         )
-        analysis: SWOTResponse = response.parsed
+        analysis = SWOTResponse.model_validate_json(
+            response["choices"][0]["message"]["content"]
+        )
         analysis_instance, _ = SWOTAnalysis.objects.get_or_create(matrix=instance)
 
         analysis_instance.so = analysis.so or "N/A"
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+from apps.company.models import CompanyProfile
+from apps.swot import tasks
+from apps.swot.models import SWOTAnalysis, SWOTMatrix
+
+
+class StubGateway:
+    """Answers every chat call with ``content`` and records the call options."""
+
+    def __init__(self, content):
+        self.content = content
+        self.calls = []
+
+    def chat(self, model, messages, **options):
+        self.calls.append({"model": model, "messages": messages, **options})
+        return {
+            "choices": [{"message": {"role": "assistant", "content": self.content}}]
+        }
+
+
+@pytest.fixture
+def matrix(db, monkeypatch):
+    monkeypatch.setattr(tasks.generate_swot_analysis, "delay", lambda pk: None)
+    company = CompanyProfile.objects.create(
+        title="Acme", tech_field=None, special_field=None, province=None, city=None
+    )
+    return SWOTMatrix.objects.create(
+        company=company,
+        matrix_type=SWOTMatrix.SWOTMatrixType.ELECTIVE,
+        strength={"1": "brand"},
+        weakness={"2": "debt"},
+        opportunity={"3": "export"},
+        threat={"4": "sanctions"},
+    )
+
+
+def stub_gateway(monkeypatch, content):
+    gateway = StubGateway(content)
+    monkeypatch.setattr(tasks, "get_llm_gateway", lambda: gateway)
+    return gateway
+
+
+def test_gateway_response_is_saved(matrix, monkeypatch):
+    gateway = stub_gateway(
+        monkeypatch, json.dumps({"so": "SO", "st": "ST", "wo": "WO", "wt": ""})
+    )
+
+    tasks.generate_swot_analysis(matrix.pk)
+
+    analysis = SWOTAnalysis.objects.get(matrix=matrix)
+    assert (analysis.so, analysis.st, analysis.wo, analysis.wt) == (
+        "SO",
+        "ST",
+        "WO",
+        "N/A",
+    )
+    (call,) = gateway.calls
+    assert call["model"] == "gemini-2.0-flash"
+    assert call["response_format"]["type"] == "json_schema"
+    assert (
+        call["response_format"]["json_schema"]["schema"]
+        == tasks.SWOTResponse.model_json_schema()
+    )
+    assert "brand" in call["messages"][0]["content"]
+
+
+@pytest.mark.parametrize(
+    "content",
+    ['{"so": "SO", "st": "ST"}', "not json", '{"so": 1, "st": "", "wo": "", "wt": ""}'],
+)
+def test_invalid_gateway_response_is_rejected(matrix, monkeypatch, content):
+    stub_gateway(monkeypatch, content)
+
+    assert tasks.generate_swot_analysis(matrix.pk)
+    assert not SWOTAnalysis.objects.filter(matrix=matrix).exists()
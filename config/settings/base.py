@@ -358,6 +358,48 @@ LOGGING["handlers"]["rotating_file"] = {  # type: ignore
 
 COOLDOWN_PERIOD = timedelta(minutes=1, seconds=30)
 
+# Quiet window used to coalesce bursts of FinancialAsset saves into one recalculation
+FINANCE_RECALCULATION_DEBOUNCE = timedelta(seconds=10)
+
+# Date columns of a finance workbook written by each ingestion task, in one
+# transaction with one upsert per statement table
+FINANCE_INGESTION_PERIODS_PER_TASK = 12
+
+# Lifetime of the materialized chart payloads; receivers invalidate them earlier
+FINANCE_CHART_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Lifetime of the per-company financial series; refreshes invalidate them earlier
+FINANCE_SERIES_CACHE_TIMEOUT = 24 * 60 * 60
+
+# Window coalescing publishes into one analysis run per company, and the number
+# of chart analyses requested from the LLM at the same time
+FINANCE_ANALYSIS_DEBOUNCE = timedelta(seconds=30)
+FINANCE_ANALYSIS_CONCURRENCY = 4
+
+# Generated analysis texts are kept this long after their last write; entries
+# for series that no longer occur simply expire
+FINANCE_ANALYSIS_CACHE_TIMEOUT = 30 * 24 * 60 * 60
+
+# Shared LLM gateway: OpenAI-compatible endpoint, per-process concurrency,
+# retries with exponential backoff and the circuit breaker thresholds
+LLM_BASE_URL = "https://api.metisai.ir/openai/v1"
+LLM_TIMEOUT = 60
+LLM_MAX_CONCURRENCY = 4
+LLM_MAX_RETRIES = 3
+LLM_RETRY_BACKOFF = 1.0
+LLM_CIRCUIT_FAILURE_THRESHOLD = 5
+LLM_CIRCUIT_RESET_TIMEOUT = 60
+
+# Write partial analysis texts to AnalysisReport while they are generated
+FINANCE_ANALYSIS_STREAMING = False
+FINANCE_ANALYSIS_STREAM_INTERVAL = 2
+
+# How long the status of a balance-sheet upload job stays queryable
+BALANCE_SHEET_UPLOAD_JOB_TIMEOUT = 24 * 60 * 60
+BALANCE_SHEET_DATA_CACHE_TIMEOUT = 24 * 60 * 60
+# Directory for a JSON dump of every parsed balance sheet, None disables it
+BALANCE_SHEET_DEBUG_DIR = None
+
 CORS_ALLOW_CREDENTIALS = True   
 
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 5000  
\ No newline at end of file
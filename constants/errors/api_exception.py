@@ -102,3 +102,9 @@ class NoQueryParameterError(APIException):
     status_code = status.HTTP_400_BAD_REQUEST
     default_detail = "No query parameter provided"
     default_code = "no_query_parameter"
+
+
+class InflationBaseYearError(APIException):
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_detail = "CPI values not found for the requested base year or chart years"
+    default_code = "invalid_inflation_base_year"